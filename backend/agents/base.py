@@ -2,25 +2,57 @@
 Base agent class for MAD agents.
 """
 
+import asyncio
+import os
+import time
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from typing import Optional, Dict, Any
 
+from .ollama_service import OllamaService, ERROR_REPLIES
+
+# Number of user/assistant exchanges kept in an agent's history. At least
+# the current exchange is kept, so the model always sees the user's message
+MAX_HISTORY_TURNS = max(1, int(os.getenv("MAX_HISTORY_TURNS", "12")))
+
+# Session used when a client doesn't send a session_id
+DEFAULT_SESSION = "default"
+
+# Idle sessions are forgotten after SESSION_TTL seconds; at most MAX_SESSIONS
+# are kept per agent, dropping the least recently used first
+SESSION_TTL = float(os.getenv("SESSION_TTL", "1800"))
+MAX_SESSIONS = int(os.getenv("MAX_SESSIONS", "1024"))
+
 
 class Agent(ABC):
     """Base class for all agents in the Multi-Agent Dungeon."""
 
-    def __init__(self, agent_id: str, name: str):
+    def __init__(
+        self,
+        agent_id: str,
+        name: str,
+        ollama_service: Optional[OllamaService] = None,
+    ):
         self.agent_id = agent_id
         self.name = name
-        self.conversation_history: list[Dict[str, str]] = []
+        self.ollama_service = ollama_service
+        self.agent_mode = os.getenv("AGENT_MODE", "simple")
+        # session_id -> {"history", "lock", "last_used"}, in least recently used order
+        self._sessions: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
 
     @abstractmethod
-    async def respond(self, message: str, context: Optional[Dict[str, Any]] = None) -> str:
+    async def respond(
+        self,
+        message: str,
+        session_id: str = DEFAULT_SESSION,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> str:
         """
         Generate a response to a user message.
 
         Args:
             message: The user's message
+            session_id: Visitor session whose conversation this message continues
             context: Optional context dictionary (e.g., poster_id, tags)
 
         Returns:
@@ -28,14 +60,111 @@ class Agent(ABC):
         """
         pass
 
-    def add_to_history(self, role: str, content: str):
-        """Add a message to the conversation history."""
-        self.conversation_history.append({"role": role, "content": content})
+    async def _respond_via_ollama(
+        self,
+        system_prompt: str,
+        session_id: str,
+        temperature: float = 0.7,
+    ) -> Optional[str]:
+        """
+        Ask Ollama to continue a session's conversation.
+
+        Args:
+            system_prompt: The agent's system prompt
+            session_id: Session whose history (ending in the user's message) is sent
+            temperature: Sampling temperature (0.0 to 1.0)
+
+        Returns:
+            The model's reply, or None if Ollama is disabled or failed
+        """
+        if self.agent_mode != "ollama" or not self.ollama_service:
+            return None
+
+        try:
+            messages = [{"role": "system", "content": system_prompt}]
+            messages.extend(self.get_history(session_id))
+
+            response = await self.ollama_service.chat(messages, temperature=temperature)
+            if response and response not in ERROR_REPLIES:
+                return response
+            print("Falling back to simple mode due to Ollama error")
+        except Exception as e:
+            print(f"Error in Ollama response: {e}")
+        return None
+
+    def purge_expired_sessions(self, now: Optional[float] = None) -> int:
+        """Forget sessions idle for longer than SESSION_TTL; return how many."""
+        if now is None:
+            now = time.monotonic()
+
+        expired = []
+        # Oldest sessions are at the front, so stop at the first live one
+        for session_id, session in self._sessions.items():
+            if now - session["last_used"] <= SESSION_TTL:
+                break
+            # A turn still holding the lock would lose its ordering if a new
+            # request for the same session got a fresh lock, so keep it
+            if not session["lock"].locked():
+                expired.append(session_id)
+        for session_id in expired:
+            del self._sessions[session_id]
+        return len(expired)
+
+    def _evict_sessions(self, count: int, keep: str):
+        """Drop up to count least recently used sessions, skipping keep and locked ones."""
+        evict = []
+        for session_id, session in self._sessions.items():
+            if len(evict) == count:
+                break
+            if session_id != keep and not session["lock"].locked():
+                evict.append(session_id)
+        for session_id in evict:
+            del self._sessions[session_id]
+
+    def _get_session(self, session_id: str) -> Dict[str, Any]:
+        """Return the state for a session, creating it and expiring idle ones."""
+        now = time.monotonic()
+        self.purge_expired_sessions(now)
+
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = {"history": [], "lock": asyncio.Lock(), "last_used": now}
+            self._sessions[session_id] = session
+            if len(self._sessions) > MAX_SESSIONS:
+                # Sessions with a turn in flight are kept, so the cap may be
+                # exceeded briefly until they finish
+                self._evict_sessions(len(self._sessions) - MAX_SESSIONS, session_id)
+        else:
+            session["last_used"] = now
+            self._sessions.move_to_end(session_id)
+
+        return session
+
+    def session_lock(self, session_id: str = DEFAULT_SESSION) -> asyncio.Lock:
+        """
+        Lock serializing turns within a session.
+
+        Concurrent requests in the same session would otherwise interleave
+        their messages in the history; different sessions run independently.
+        """
+        return self._get_session(session_id)["lock"]
+
+    def add_to_history(self, session_id: str, role: str, content: str):
+        """Add a message to a session's history, dropping the oldest turns."""
+        history = self._get_session(session_id)["history"]
+        history.append({"role": role, "content": content})
+
+        overflow = len(history) - MAX_HISTORY_TURNS * 2
+        if overflow > 0:
+            # Never leave an assistant reply at the front without its question
+            if history[overflow]["role"] == "assistant":
+                overflow += 1
+            del history[:overflow]
 
-    def clear_history(self):
-        """Clear the conversation history."""
-        self.conversation_history = []
+    def clear_history(self, session_id: str = DEFAULT_SESSION):
+        """Clear the conversation history of a session."""
+        self._sessions.pop(session_id, None)
 
-    def get_history(self) -> list[Dict[str, str]]:
-        """Get the conversation history."""
-        return self.conversation_history
+    def get_history(self, session_id: str = DEFAULT_SESSION) -> list[Dict[str, str]]:
+        """Get the conversation history of a session."""
+        return self._get_session(session_id)["history"]
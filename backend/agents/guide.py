@@ -2,15 +2,42 @@
 Guide Agent - Helps visitors navigate the open house and find posters.
 """
 
-from typing import Optional, Dict, Any, List
-from .base import Agent
+import re
+from collections import defaultdict
+from typing import Optional, Dict, Any, List, Set
+from .base import Agent, DEFAULT_SESSION
 from .ollama_service import OllamaService
-import os
+
+# Static part of the guide's system prompt. It comes before the poster list so
+# every guide conversation starts with the same bytes and Ollama can reuse the
+# KV cache for it.
+GUIDE_PROMPT_PREFIX = """You are a friendly guide at the RISE Computer Science open house.
+
+Your role:
+- Help visitors find posters and demos based on their interests
+- Provide directions to specific rooms and booths
+- Recommend posters based on topics the visitor is interested in
+- Give a warm, welcoming experience
+
+Room Layout:
+- Corridor: Main hallway with booths
+- Room 1: First exhibition room
+- Room 2: Second exhibition room
+
+Remember: Be concise and helpful. When recommending posters, mention the location (room and booth number).
+"""
 
 
 class GuideAgent(Agent):
     """Agent that helps visitors navigate and find interesting posters."""
 
+    # Intent keywords for simple mode, compiled once for all instances.
+    # Whole words only, with plurals spelled out, so "whoever" or
+    # "findings" don't trigger an intent
+    _GREETING_RE = re.compile(r"\b(?:hello|hi|hey)\b", re.IGNORECASE)
+    _LIST_RE = re.compile(r"\b(?:what posters|show me all|list posters|what do you have)\b", re.IGNORECASE)
+    _DIRECTIONS_RE = re.compile(r"\b(?:where|locations?|find|directions?)\b", re.IGNORECASE)
+
     def __init__(
         self,
         agent_id: str,
@@ -18,13 +45,15 @@ class GuideAgent(Agent):
         all_posters: List[Dict[str, Any]],
         ollama_service: Optional[OllamaService] = None,
     ):
-        super().__init__(agent_id, name)
+        super().__init__(agent_id, name, ollama_service)
         self.all_posters = all_posters
-        self.ollama_service = ollama_service
-        self.agent_mode = os.getenv("AGENT_MODE", "simple")
+        self._build_tag_index()
+        self._build_simple_replies()
+        # Poster data is static for the agent's lifetime, so build the prompt once
+        self._system_prompt = self._build_system_prompt()
 
     def _build_system_prompt(self) -> str:
-        """Build the system prompt with information about all posters."""
+        """Build the system prompt: fixed instructions followed by all posters."""
         poster_summaries = "\n\n".join([
             f"Poster {i+1}: {poster['title']}\n"
             f"  Authors: {', '.join(poster['authors'])}\n"
@@ -34,102 +63,98 @@ class GuideAgent(Agent):
             for i, poster in enumerate(self.all_posters)
         ])
 
-        return f"""You are a friendly guide at the RISE Computer Science open house.
+        return f"{GUIDE_PROMPT_PREFIX}\nAvailable Posters:\n{poster_summaries}\n"
 
-Your role:
-- Help visitors find posters and demos based on their interests
-- Provide directions to specific rooms and booths
-- Recommend posters based on topics the visitor is interested in
-- Give a warm, welcoming experience
+    def _build_tag_index(self):
+        """Index poster tags so topic lookups don't rescan every poster."""
+        # Lowercased tag -> indices of posters carrying it
+        self._tag_index: Dict[str, Set[int]] = defaultdict(set)
+        # Every substring of every tag -> poster indices, so a query word that
+        # appears anywhere inside a tag is a single dict lookup
+        self._tag_substring_index: Dict[str, Set[int]] = defaultdict(set)
 
-Available Posters:
-{poster_summaries}
+        for idx, poster in enumerate(self.all_posters):
+            for tag in poster['tags']:
+                tag_lower = tag.lower()
+                self._tag_index[tag_lower].add(idx)
+                for start in range(len(tag_lower)):
+                    for end in range(start + 1, len(tag_lower) + 1):
+                        self._tag_substring_index[tag_lower[start:end]].add(idx)
+
+    def _build_simple_replies(self):
+        """Pre-render the per-poster text used by the template responses."""
+        # "- Title (room, booth)" listing line for each poster
+        self._poster_lines = [
+            f"- {poster['title']} ({poster.get('room', 'unknown')}, {poster.get('booth_id', 'unknown')})"
+            for poster in self.all_posters
+        ]
+        poster_list = "\n".join(self._poster_lines)
+        self._poster_list_reply = f"We have these posters:\n{poster_list}\n\nWould you like to know more about any specific topic?"
+        # Reply used when a topic matches exactly one poster
+        self._single_match_replies = [
+            f"For {', '.join(poster['tags'])}, I recommend '{poster['title']}' by {', '.join(poster['authors'])}. You'll find it in {poster.get('room', 'the building')} at {poster.get('booth_id', 'a booth')}. {poster['abstract'][:100]}..."
+            for poster in self.all_posters
+        ]
+
+    def _find_poster_indices_by_tag(self, query: str) -> List[int]:
+        """Find indices of posters matching tags in the query, in poster order."""
+        query_lower = query.lower()
+        matches: Set[int] = set()
 
-Room Layout:
-- Corridor: Main hallway with booths
-- Room 1: First exhibition room
-- Room 2: Second exhibition room
+        # Whole tag mentioned in the query
+        for tag, indices in self._tag_index.items():
+            if tag in query_lower:
+                matches |= indices
 
-Remember: Be concise and helpful. When recommending posters, mention the location (room and booth number).
-"""
+        # Query word contained in a tag
+        for word in set(query_lower.split()):
+            matches |= self._tag_substring_index.get(word, set())
+
+        return sorted(matches)
 
     def _find_posters_by_tag(self, query: str) -> List[Dict[str, Any]]:
         """Find posters matching tags in the query."""
-        query_lower = query.lower()
-        matching_posters = []
-
-        for poster in self.all_posters:
-            # Check if any tag matches words in the query
-            for tag in poster['tags']:
-                if tag.lower() in query_lower or any(
-                    word in tag.lower() for word in query_lower.split()
-                ):
-                    matching_posters.append(poster)
-                    break
-
-        return matching_posters
+        return [self.all_posters[idx] for idx in self._find_poster_indices_by_tag(query)]
 
     def _simple_response(self, message: str) -> str:
         """Generate a simple template-based response (fallback mode)."""
-        message_lower = message.lower()
-
         # Greeting
-        if any(word in message_lower for word in ["hello", "hi", "hey"]):
+        if self._GREETING_RE.search(message):
             return "Welcome to the RISE Computer Science open house! I'm your guide. I can help you find posters based on your interests or give you directions. What topics interest you?"
 
         # List all posters
-        if any(phrase in message_lower for phrase in ["what posters", "show me all", "list posters", "what do you have"]):
-            poster_list = "\n".join([
-                f"- {poster['title']} ({poster.get('room', 'unknown')}, {poster.get('booth_id', 'unknown')})"
-                for poster in self.all_posters
-            ])
-            return f"We have these posters:\n{poster_list}\n\nWould you like to know more about any specific topic?"
+        if self._LIST_RE.search(message):
+            return self._poster_list_reply
 
         # Find posters by topic
-        matching = self._find_posters_by_tag(message)
+        matching = self._find_poster_indices_by_tag(message)
         if matching:
             if len(matching) == 1:
-                poster = matching[0]
-                return f"For {', '.join(poster['tags'])}, I recommend '{poster['title']}' by {', '.join(poster['authors'])}. You'll find it in {poster.get('room', 'the building')} at {poster.get('booth_id', 'a booth')}. {poster['abstract'][:100]}..."
+                return self._single_match_replies[matching[0]]
             else:
-                recommendations = "\n".join([
-                    f"- {p['title']} ({p.get('room', 'unknown')}, {p.get('booth_id', 'unknown')})"
-                    for p in matching[:3]
-                ])
+                recommendations = "\n".join(self._poster_lines[idx] for idx in matching[:3])
                 return f"I found {len(matching)} posters related to your interest:\n{recommendations}\n\nWould you like details about any of these?"
 
         # Directions
-        if any(word in message_lower for word in ["where", "location", "find", "direction"]):
+        if self._DIRECTIONS_RE.search(message):
             return "The exhibition has three areas: the main corridor with several booths, and two side rooms (Room 1 and Room 2). Which topic are you looking for?"
 
         # Default
         return "I can help you find posters on topics like AI, robotics, security, healthcare, and sustainability. What interests you?"
 
-    async def respond(self, message: str, context: Optional[Dict[str, Any]] = None) -> str:
+    async def respond(
+        self,
+        message: str,
+        session_id: str = DEFAULT_SESSION,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> str:
         """Generate a response to help the visitor navigate."""
-        self.add_to_history("user", message)
-
-        # Use Ollama if available and mode is set
-        if self.agent_mode == "ollama" and self.ollama_service:
-            try:
-                system_prompt = self._build_system_prompt()
-
-                # Build conversation messages
-                messages = [{"role": "system", "content": system_prompt}]
-                messages.extend(self.conversation_history)
-
-                response = await self.ollama_service.chat(messages, temperature=0.7)
-
-                if response and "trouble connecting" not in response:
-                    self.add_to_history("assistant", response)
-                    return response
-                else:
-                    # Fallback to simple mode if Ollama fails
-                    print("Falling back to simple mode due to Ollama error")
-            except Exception as e:
-                print(f"Error in Ollama response: {e}")
-
-        # Simple template-based response
-        response = self._simple_response(message)
-        self.add_to_history("assistant", response)
+        self.add_to_history(session_id, "user", message)
+
+        response = await self._respond_via_ollama(self._system_prompt, session_id)
+        if response is None:
+            # Simple template-based response
+            response = self._simple_response(message)
+
+        self.add_to_history(session_id, "assistant", response)
         return response
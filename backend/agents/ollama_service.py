@@ -2,9 +2,20 @@
 Ollama service wrapper for LLM interactions.
 """
 
+import asyncio
+import hashlib
 import os
-from typing import Optional, List, Dict
-import httpx
+import time
+from collections import OrderedDict
+from typing import Optional, List, Dict, Tuple
+
+import aiohttp
+import orjson
+
+# Replies returned in place of model output when a request fails
+CONNECTION_ERROR_REPLY = "I'm having trouble connecting to my knowledge base right now. Please try again later."
+UNEXPECTED_ERROR_REPLY = "I encountered an unexpected error. Please try again."
+ERROR_REPLIES = frozenset({CONNECTION_ERROR_REPLY, UNEXPECTED_ERROR_REPLY})
 
 
 class OllamaService:
@@ -18,6 +29,86 @@ class OllamaService:
         self.host = host or os.getenv("OLLAMA_HOST", "http://localhost:11434")
         self.model = model or os.getenv("OLLAMA_MODEL", "llama2")
         self.timeout = 60.0
+        # Keep the model resident so Ollama can reuse the KV cache for the
+        # unchanged system prompt + history prefix across turns
+        self.keep_alive = os.getenv("OLLAMA_KEEP_ALIVE", "60m")
+        # Long-lived session so connections to Ollama are kept alive between calls.
+        # Created lazily because aiohttp sessions must be bound to a running loop.
+        self._session: Optional[aiohttp.ClientSession] = None
+        # Exact-match reply cache: key -> (stored_at, reply), kept in LRU order
+        self.cache_size = int(os.getenv("OLLAMA_CACHE_SIZE", "1024"))
+        self.cache_ttl = float(os.getenv("OLLAMA_CACHE_TTL", "3600"))
+        self._cache: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        # Last connection check as (checked_at, is_connected), reused for a few seconds
+        self.connection_check_ttl = 5.0
+        self._connection_status: Optional[Tuple[float, bool]] = None
+        # Circuit breaker: after max_failures consecutive chat errors, stop
+        # calling Ollama for failure_cooldown seconds so callers fall back fast
+        self.max_failures = 3
+        self.failure_cooldown = 30.0
+        self._consecutive_failures = 0
+        self._retry_at = 0.0
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers={"Content-Type": "application/json"},
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                connector=aiohttp.TCPConnector(
+                    limit=100,
+                    limit_per_host=40,
+                    keepalive_timeout=30,
+                ),
+            )
+        return self._session
+
+    def _cache_key(self, messages: List[Dict[str, str]], temperature: float) -> str:
+        """Hash the full chat request so only identical conversations share a reply."""
+        raw = orjson.dumps(
+            {"model": self.model, "temperature": temperature, "messages": messages},
+            option=orjson.OPT_SORT_KEYS,
+        )
+        return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+    def _cache_get(self, key: str) -> Optional[str]:
+        """Return a cached reply if present and not expired."""
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        stored_at, reply = entry
+        if time.monotonic() - stored_at > self.cache_ttl:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return reply
+
+    def _cache_put(self, key: str, reply: str):
+        """Store a reply, evicting the least recently used entry when full."""
+        if self.cache_size <= 0:
+            return
+        self._cache[key] = (time.monotonic(), reply)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _circuit_open(self) -> bool:
+        """Whether chat calls are currently being skipped after repeated failures."""
+        return time.monotonic() < self._retry_at
+
+    def _record_failure(self):
+        """Count a failed chat call, opening the circuit once the limit is hit."""
+        self._consecutive_failures += 1
+        if self._consecutive_failures >= self.max_failures:
+            self._retry_at = time.monotonic() + self.failure_cooldown
+            self._consecutive_failures = 0
+            print(f"Ollama failed {self.max_failures} times in a row, "
+                  f"skipping it for {self.failure_cooldown:.0f}s")
+
+    async def aclose(self):
+        """Close the underlying HTTP session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
 
     async def generate(
         self,
@@ -37,33 +128,32 @@ class OllamaService:
             The generated response
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                payload = {
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {
-                        "temperature": temperature,
-                    }
+            payload = {
+                "model": self.model,
+                "prompt": prompt,
+                "stream": False,
+                "keep_alive": self.keep_alive,
+                "options": {
+                    "temperature": temperature,
                 }
+            }
 
-                if system_prompt:
-                    payload["system"] = system_prompt
+            if system_prompt:
+                payload["system"] = system_prompt
 
-                response = await client.post(
-                    f"{self.host}/api/generate",
-                    json=payload
-                )
+            async with self._get_session().post(
+                f"{self.host}/api/generate", data=orjson.dumps(payload)
+            ) as response:
                 response.raise_for_status()
-                result = response.json()
-                return result.get("response", "")
+                result = orjson.loads(await response.read())
+            return result.get("response", "")
 
-        except httpx.HTTPError as e:
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             print(f"Error connecting to Ollama: {e}")
-            return "I'm having trouble connecting to my knowledge base right now. Please try again later."
+            return CONNECTION_ERROR_REPLY
         except Exception as e:
             print(f"Unexpected error in Ollama service: {e}")
-            return "I encountered an unexpected error. Please try again."
+            return UNEXPECTED_ERROR_REPLY
 
     async def chat(
         self,
@@ -80,37 +170,68 @@ class OllamaService:
         Returns:
             The generated response
         """
+        cache_key = self._cache_key(messages, temperature)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        if self._circuit_open():
+            return CONNECTION_ERROR_REPLY
+
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                payload = {
-                    "model": self.model,
-                    "messages": messages,
-                    "stream": False,
-                    "options": {
-                        "temperature": temperature,
-                    }
+            payload = {
+                "model": self.model,
+                "messages": messages,
+                "stream": False,
+                "keep_alive": self.keep_alive,
+                "options": {
+                    "temperature": temperature,
                 }
+            }
 
-                response = await client.post(
-                    f"{self.host}/api/chat",
-                    json=payload
-                )
+            async with self._get_session().post(
+                f"{self.host}/api/chat", data=orjson.dumps(payload)
+            ) as response:
                 response.raise_for_status()
-                result = response.json()
-                return result.get("message", {}).get("content", "")
-
-        except httpx.HTTPError as e:
+                result = orjson.loads(await response.read())
+            reply = result.get("message", {}).get("content", "")
+            self._consecutive_failures = 0
+            if reply:
+                self._cache_put(cache_key, reply)
+            return reply
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             print(f"Error connecting to Ollama: {e}")
-            return "I'm having trouble connecting to my knowledge base right now. Please try again later."
+            self._record_failure()
+            return CONNECTION_ERROR_REPLY
         except Exception as e:
             print(f"Unexpected error in Ollama service: {e}")
-            return "I encountered an unexpected error. Please try again."
+            self._record_failure()
+            return UNEXPECTED_ERROR_REPLY
+
+    async def check_connection(self, force: bool = False) -> bool:
+        """
+        Check if Ollama is available.
+
+        Args:
+            force: Skip the cached result and always query Ollama
+
+        Returns:
+            True if Ollama answered the last check
+        """
+        now = time.monotonic()
+        if not force and self._connection_status is not None:
+            checked_at, is_connected = self._connection_status
+            if now - checked_at < self.connection_check_ttl:
+                return is_connected
 
-    async def check_connection(self) -> bool:
-        """Check if Ollama is available."""
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(f"{self.host}/api/tags")
-                return response.status_code == 200
+            async with self._get_session().get(
+                f"{self.host}/api/tags", timeout=aiohttp.ClientTimeout(total=5.0)
+            ) as response:
+                is_connected = response.status == 200
         except Exception:
-            return False
+            is_connected = False
+
+        self._connection_status = (time.monotonic(), is_connected)
+        return is_connected
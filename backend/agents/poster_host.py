@@ -2,15 +2,23 @@
 Poster Host Agent - Expert on a specific research poster.
 """
 
-from typing import Optional, Dict, Any
-from .base import Agent
+import re
+from typing import Optional, Dict, Any, List, Tuple
+from .base import Agent, DEFAULT_SESSION
 from .ollama_service import OllamaService
-import os
 
 
 class PosterHostAgent(Agent):
     """Agent that acts as an expert on a specific research poster."""
 
+    # Keyword patterns for the template-based replies.
+    # Whole words only, with plurals spelled out, so "whoever" or
+    # "findings" don't trigger an intent
+    _GREETING_RE = re.compile(r"\b(?:hello|hi|hey)\b", re.IGNORECASE)
+    _ABOUT_RE = re.compile(r"\b(?:about|summary|what is this|tell me)\b", re.IGNORECASE)
+    _AUTHOR_RE = re.compile(r"\b(?:authors?|who)\b", re.IGNORECASE)
+    _TOPIC_RE = re.compile(r"\b(?:topics?|tags?|areas?|fields?)\b", re.IGNORECASE)
+
     def __init__(
         self,
         agent_id: str,
@@ -18,10 +26,12 @@ class PosterHostAgent(Agent):
         poster_data: Dict[str, Any],
         ollama_service: Optional[OllamaService] = None,
     ):
-        super().__init__(agent_id, name)
+        super().__init__(agent_id, name, ollama_service)
         self.poster_data = poster_data
-        self.ollama_service = ollama_service
-        self.agent_mode = os.getenv("AGENT_MODE", "simple")
+        # The poster never changes after construction; build the prompt up front
+        self._system_prompt = self._build_system_prompt()
+        self._faq_patterns = self._compile_faq_patterns()
+        self._replies = self._build_simple_replies()
 
     def _build_system_prompt(self) -> str:
         """Build the system prompt with poster information."""
@@ -51,60 +61,67 @@ Abstract:
 Remember: Be enthusiastic about the research but concise. Keep responses under 3-4 sentences unless more detail is specifically requested.
 """
 
+    def _compile_faq_patterns(self) -> List[Tuple[re.Pattern, str]]:
+        """Compile one pattern per FAQ entry matching any word of its question."""
+        patterns = []
+        for faq_item in self.poster_data.get("faq") or []:
+            words = faq_item["question"].lower().split()
+            if words:
+                pattern = re.compile("|".join(re.escape(word) for word in words))
+                patterns.append((pattern, faq_item["answer"]))
+        return patterns
+
+    def _build_simple_replies(self) -> Dict[str, str]:
+        """Pre-render the fixed template responses for this poster."""
+        poster = self.poster_data
+        return {
+            "greeting": f"Hello! I'm here to tell you about our research on {poster['title']}. What would you like to know?",
+            "about": f"{poster['abstract'][:200]}... Would you like to know more about a specific aspect?",
+            "authors": f"This research was conducted by {', '.join(poster['authors'])}.",
+            "topics": f"This poster covers: {', '.join(poster['tags'])}.",
+            "default": f"That's an interesting question about {poster['title']}. Our research focuses on {poster['abstract'][:150]}...",
+        }
+
     def _simple_response(self, message: str) -> str:
         """Generate a simple template-based response (fallback mode)."""
-        message_lower = message.lower()
-
         # Greeting
-        if any(word in message_lower for word in ["hello", "hi", "hey"]):
-            return f"Hello! I'm here to tell you about our research on {self.poster_data['title']}. What would you like to know?"
+        if self._GREETING_RE.search(message):
+            return self._replies["greeting"]
 
         # About/summary
-        if any(word in message_lower for word in ["about", "summary", "what is this", "tell me"]):
-            return f"{self.poster_data['abstract'][:200]}... Would you like to know more about a specific aspect?"
+        if self._ABOUT_RE.search(message):
+            return self._replies["about"]
 
         # Authors
-        if "author" in message_lower or "who" in message_lower:
-            return f"This research was conducted by {', '.join(self.poster_data['authors'])}."
+        if self._AUTHOR_RE.search(message):
+            return self._replies["authors"]
 
         # Tags/topics
-        if any(word in message_lower for word in ["topic", "tag", "area", "field"]):
-            return f"This poster covers: {', '.join(self.poster_data['tags'])}."
+        if self._TOPIC_RE.search(message):
+            return self._replies["topics"]
 
         # FAQ lookup
-        if "faq" in self.poster_data:
-            for faq_item in self.poster_data["faq"]:
-                if any(word in message_lower for word in faq_item["question"].lower().split()):
-                    return faq_item["answer"]
+        message_lower = message.lower()
+        for pattern, answer in self._faq_patterns:
+            if pattern.search(message_lower):
+                return answer
 
         # Default
-        return f"That's an interesting question about {self.poster_data['title']}. Our research focuses on {self.poster_data['abstract'][:150]}..."
+        return self._replies["default"]
 
-    async def respond(self, message: str, context: Optional[Dict[str, Any]] = None) -> str:
+    async def respond(
+        self,
+        message: str,
+        session_id: str = DEFAULT_SESSION,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> str:
         """Generate a response about the poster."""
-        self.add_to_history("user", message)
-
-        # Use Ollama if available and mode is set
-        if self.agent_mode == "ollama" and self.ollama_service:
-            try:
-                system_prompt = self._build_system_prompt()
-
-                # Build conversation messages
-                messages = [{"role": "system", "content": system_prompt}]
-                messages.extend(self.conversation_history)
-
-                response = await self.ollama_service.chat(messages, temperature=0.7)
-
-                if response and "trouble connecting" not in response:
-                    self.add_to_history("assistant", response)
-                    return response
-                else:
-                    # Fallback to simple mode if Ollama fails
-                    print("Falling back to simple mode due to Ollama error")
-            except Exception as e:
-                print(f"Error in Ollama response: {e}")
-
-        # Simple template-based response
-        response = self._simple_response(message)
-        self.add_to_history("assistant", response)
+        self.add_to_history(session_id, "user", message)
+
+        response = await self._respond_via_ollama(self._system_prompt, session_id)
+        if response is None:
+            # Simple template-based response
+            response = self._simple_response(message)
+
+        self.add_to_history(session_id, "assistant", response)
         return response
@@ -3,16 +3,20 @@ FastAPI backend for Multi-Agent Dungeon (MAD).
 """
 
 import os
-import json
-from typing import Optional, Dict
+import asyncio
+import hashlib
+from typing import Optional, Dict, Any, List, Tuple
 from pathlib import Path
 
-from fastapi import FastAPI, HTTPException
+import orjson
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict
 from dotenv import load_dotenv
 
 from agents import PosterHostAgent, GuideAgent
+from agents.base import DEFAULT_SESSION
 from agents.ollama_service import OllamaService
 
 # Load environment variables
@@ -22,7 +26,8 @@ load_dotenv()
 app = FastAPI(
     title="Multi-Agent Dungeon API",
     description="Backend service for the MAD open house virtual environment",
-    version="0.1.0"
+    version="0.1.0",
+    default_response_class=ORJSONResponse,
 )
 
 # Add CORS middleware to allow Godot client to connect
@@ -39,25 +44,63 @@ DATA_DIR = Path(__file__).parent / "data"
 POSTERS_FILE = DATA_DIR / "posters.json"
 
 posters_data = []
+# Pre-serialized poster payloads as (body, etag); posters are read-only after load
+posters_list_response: Tuple[bytes, str] = (b"", "")
+poster_responses: Dict[str, Tuple[bytes, str]] = {}
 poster_agents: Dict[str, PosterHostAgent] = {}
 guide_agent: Optional[GuideAgent] = None
 ollama_service: Optional[OllamaService] = None
+session_janitor_task: Optional[asyncio.Task] = None
+
+# How often idle visitor sessions are swept from all agents (seconds)
+SESSION_SWEEP_INTERVAL = float(os.getenv("SESSION_SWEEP_INTERVAL", "3600"))
+
+# Upper bound on requests accepted by /agent/batch
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", "32"))
 
 
 def load_posters():
     """Load poster data from JSON file."""
     global posters_data
     try:
-        with open(POSTERS_FILE, "r") as f:
-            posters_data = json.load(f)
+        posters_data = orjson.loads(POSTERS_FILE.read_bytes())
         print(f"Loaded {len(posters_data)} posters")
     except FileNotFoundError:
         print(f"Warning: {POSTERS_FILE} not found. Using empty poster list.")
         posters_data = []
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         print(f"Error parsing {POSTERS_FILE}: {e}")
         posters_data = []
 
+    cache_poster_responses()
+
+
+def _with_etag(body: bytes) -> Tuple[bytes, str]:
+    """Pair a response body with a strong ETag derived from its content."""
+    return body, f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def cache_poster_responses():
+    """Serialize the /posters and /posters/{id} responses once."""
+    global posters_list_response, poster_responses
+    posters_list_response = _with_etag(
+        orjson.dumps({"count": len(posters_data), "posters": posters_data})
+    )
+    poster_responses = {p["id"]: _with_etag(orjson.dumps(p)) for p in posters_data}
+
+
+def cached_json_response(request: Request, cached: Tuple[bytes, str]) -> Response:
+    """Return the cached body, or 304 Not Modified if the client already has it."""
+    body, etag = cached
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=60"}
+
+    if_none_match = request.headers.get("if-none-match", "")
+    client_etags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if etag in client_etags or "*" in client_etags:
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
+
 
 def initialize_agents():
     """Initialize all agents (poster hosts and guide)."""
@@ -93,32 +136,58 @@ def initialize_agents():
     print(f"Initialized {len(poster_agents)} poster host agents and 1 guide agent")
 
 
+async def sweep_sessions():
+    """Periodically drop expired sessions, including from agents nobody talks to."""
+    while True:
+        await asyncio.sleep(SESSION_SWEEP_INTERVAL)
+        agents = list(poster_agents.values()) + ([guide_agent] if guide_agent else [])
+        purged = sum(agent.purge_expired_sessions() for agent in agents)
+        if purged:
+            print(f"Purged {purged} expired sessions")
+
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize data and agents on startup."""
+    global session_janitor_task
+
     load_posters()
     initialize_agents()
+    session_janitor_task = asyncio.create_task(sweep_sessions())
 
     # Check Ollama connection if in ollama mode
     if ollama_service:
-        is_connected = await ollama_service.check_connection()
+        is_connected = await ollama_service.check_connection(force=True)
         if is_connected:
             print("✓ Successfully connected to Ollama")
         else:
             print("✗ Could not connect to Ollama - will use simple mode as fallback")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release resources held by the agent services."""
+    if session_janitor_task:
+        session_janitor_task.cancel()
+    if ollama_service:
+        await ollama_service.aclose()
+
+
 # Request/Response models
 class AgentRequest(BaseModel):
     """Request to interact with an agent."""
+    model_config = ConfigDict(frozen=True)
+
     agent_type: str  # "poster_host" or "guide"
     message: str
     poster_id: Optional[str] = None  # Required for poster_host agents
-    session_id: Optional[str] = None  # For future session management
+    session_id: Optional[str] = None  # Keeps visitors' conversations apart
 
 
 class AgentResponse(BaseModel):
     """Response from an agent."""
+    model_config = ConfigDict(frozen=True)
+
     reply: str
     agent_type: str
     poster_id: Optional[str] = None
@@ -137,35 +206,36 @@ async def root():
 
 
 @app.get("/posters")
-async def list_posters():
+async def list_posters(request: Request):
     """List all available posters."""
-    return {
-        "count": len(posters_data),
-        "posters": posters_data
-    }
+    return cached_json_response(request, posters_list_response)
 
 
 @app.get("/posters/{poster_id}")
-async def get_poster(poster_id: str):
+async def get_poster(poster_id: str, request: Request):
     """Get details for a specific poster."""
-    poster = next((p for p in posters_data if p["id"] == poster_id), None)
-    if not poster:
+    cached = poster_responses.get(poster_id)
+    if not cached:
         raise HTTPException(status_code=404, detail=f"Poster {poster_id} not found")
-    return poster
+    return cached_json_response(request, cached)
 
 
-@app.post("/agent", response_model=AgentResponse)
-async def interact_with_agent(request: AgentRequest):
+async def dispatch_agent_request(request: AgentRequest) -> Dict[str, Any]:
     """
-    Interact with an agent (poster host or guide).
+    Route a request to the right agent and return its reply.
 
     Args:
         request: AgentRequest with agent_type, message, and optional poster_id
+            and session_id
 
     Returns:
-        AgentResponse with the agent's reply
+        AgentResponse-shaped dict with the agent's reply
+
+    Raises:
+        HTTPException: If the agent type or poster is unknown
     """
     agent_type = request.agent_type.lower()
+    session_id = request.session_id or DEFAULT_SESSION
 
     # Route to appropriate agent
     if agent_type == "poster_host":
@@ -182,13 +252,14 @@ async def interact_with_agent(request: AgentRequest):
             )
 
         agent = poster_agents[request.poster_id]
-        reply = await agent.respond(request.message)
+        async with agent.session_lock(session_id):
+            reply = await agent.respond(request.message, session_id)
 
-        return AgentResponse(
-            reply=reply,
-            agent_type="poster_host",
-            poster_id=request.poster_id
-        )
+        return {
+            "reply": reply,
+            "agent_type": "poster_host",
+            "poster_id": request.poster_id,
+        }
 
     elif agent_type == "guide":
         if not guide_agent:
@@ -197,13 +268,14 @@ async def interact_with_agent(request: AgentRequest):
                 detail="Guide agent not initialized"
             )
 
-        reply = await guide_agent.respond(request.message)
+        async with guide_agent.session_lock(session_id):
+            reply = await guide_agent.respond(request.message, session_id)
 
-        return AgentResponse(
-            reply=reply,
-            agent_type="guide",
-            poster_id=None
-        )
+        return {
+            "reply": reply,
+            "agent_type": "guide",
+            "poster_id": None,
+        }
 
     else:
         raise HTTPException(
@@ -212,6 +284,58 @@ async def interact_with_agent(request: AgentRequest):
         )
 
 
+# The handlers return plain dicts matching AgentResponse; skipping response_model
+# avoids re-validating every reply, while the schema still documents the shape.
+@app.post("/agent", response_model=None, responses={200: {"model": AgentResponse}})
+async def interact_with_agent(request: AgentRequest):
+    """
+    Interact with an agent (poster host or guide).
+
+    Args:
+        request: AgentRequest with agent_type, message, and optional poster_id
+            and session_id
+
+    Returns:
+        AgentResponse with the agent's reply
+    """
+    return await dispatch_agent_request(request)
+
+
+@app.post("/agent/batch", response_model=None, responses={200: {"model": List[AgentResponse]}})
+async def interact_with_agents_batch(requests: List[AgentRequest]):
+    """
+    Send several agent requests at once and run them concurrently.
+
+    Args:
+        requests: List of AgentRequest objects
+
+    Returns:
+        List with one entry per request, in order: an AgentResponse, or an
+        object with "error" and "status_code" if that request failed
+    """
+    if len(requests) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch too large: {len(requests)} requests (max {MAX_BATCH_SIZE})"
+        )
+
+    results = await asyncio.gather(
+        *[dispatch_agent_request(r) for r in requests],
+        return_exceptions=True,
+    )
+
+    replies = []
+    for request, result in zip(requests, results):
+        if isinstance(result, HTTPException):
+            replies.append({"error": result.detail, "status_code": result.status_code})
+        elif isinstance(result, Exception):
+            print(f"Error in batch request for {request.agent_type}: {result}")
+            replies.append({"error": "Internal error", "status_code": 500})
+        else:
+            replies.append(result)
+    return replies
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
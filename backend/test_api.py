@@ -1,14 +1,23 @@
 """
 Simple test script for the MAD API.
+
+Usage:
+    python test_api.py            # Concurrent smoke + load test
+    python test_api.py --seq      # Step through each endpoint one at a time
+    python test_api.py -n 100     # Number of concurrent requests per agent type
 """
 
+import argparse
 import asyncio
+import time
 import httpx
 
+BASE_URL = "http://localhost:8000"
+
 
 async def test_api():
     """Test the MAD API endpoints."""
-    base_url = "http://localhost:8000"
+    base_url = BASE_URL
 
     async with httpx.AsyncClient() as client:
         print("=" * 60)
@@ -82,5 +91,90 @@ async def test_api():
         print("=" * 60)
 
 
+def percentile(samples, pct):
+    """Return the pct-th percentile of a list of samples (nearest rank)."""
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+async def timed_agent_call(client, payload):
+    """POST one /agent request and return (status_code, seconds)."""
+    start = time.perf_counter()
+    response = await client.post(f"{BASE_URL}/agent", json=payload)
+    return response.status_code, time.perf_counter() - start
+
+
+async def test_api_concurrent(requests_per_agent: int = 50):
+    """Hit all endpoints at once, then fan out concurrent /agent requests."""
+    limits = httpx.Limits(max_connections=requests_per_agent * 2)
+    async with httpx.AsyncClient(timeout=120.0, limits=limits) as client:
+        print("=" * 60)
+        print("Testing MAD API (concurrent)")
+        print("=" * 60)
+
+        # Smoke test: every read endpoint in one round trip
+        print("\n1. Smoke testing read endpoints...")
+        paths = ["/", "/posters", "/posters/poster_001", "/health"]
+        responses = await asyncio.gather(*[client.get(f"{BASE_URL}{path}") for path in paths])
+        for path, response in zip(paths, responses):
+            print(f"  {path}: {response.status_code}")
+
+        # Load test: one session per request so they don't queue behind each other
+        print(f"\n2. Sending {requests_per_agent} concurrent requests per agent type...")
+        loads = {
+            "guide": [
+                {
+                    "agent_type": "guide",
+                    "message": "Hello! What posters do you have about robotics?",
+                    "session_id": f"load-guide-{i}",
+                }
+                for i in range(requests_per_agent)
+            ],
+            "poster_host": [
+                {
+                    "agent_type": "poster_host",
+                    "message": "What is this research about?",
+                    "poster_id": "poster_001",
+                    "session_id": f"load-host-{i}",
+                }
+                for i in range(requests_per_agent)
+            ],
+        }
+
+        for agent_type, payloads in loads.items():
+            start = time.perf_counter()
+            results = await asyncio.gather(*[timed_agent_call(client, p) for p in payloads])
+            wall = time.perf_counter() - start
+
+            latencies = [elapsed for _, elapsed in results]
+            failures = sum(1 for status, _ in results if status != 200)
+            print(f"  {agent_type}: {len(results)} requests in {wall:.2f}s, "
+                  f"p50={percentile(latencies, 50) * 1000:.0f}ms, "
+                  f"p95={percentile(latencies, 95) * 1000:.0f}ms, "
+                  f"failures={failures}")
+
+        print("\n" + "=" * 60)
+        print("All tests completed!")
+        print("=" * 60)
+
+
 if __name__ == "__main__":
-    asyncio.run(test_api())
+    parser = argparse.ArgumentParser(description="Test the MAD API")
+    parser.add_argument(
+        "--seq",
+        action="store_true",
+        help="Run the sequential endpoint walkthrough instead of the load test"
+    )
+    parser.add_argument(
+        "-n", "--requests",
+        type=int,
+        default=50,
+        help="Concurrent requests per agent type (default: 50)"
+    )
+    args = parser.parse_args()
+
+    if args.seq:
+        asyncio.run(test_api())
+    else:
+        asyncio.run(test_api_concurrent(args.requests))
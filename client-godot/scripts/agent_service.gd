@@ -9,12 +9,16 @@ signal error_occurred(error_message: String)
 
 var http_request: HTTPRequest
 
+# Identifies this player's conversations to the backend
+var session_id: String = ""
+
 
 func _enter_tree() -> void:
 	# Create HTTP request node early (before _ready)
 	http_request = HTTPRequest.new()
 	add_child(http_request)
 	http_request.request_completed.connect(_on_request_completed)
+	session_id = "%08x%08x" % [randi(), randi()]
 
 
 func send_message_to_agent(agent_type: String, message: String, poster_id: String = "") -> void:
@@ -32,7 +36,8 @@ func send_message_to_agent(agent_type: String, message: String, poster_id: Strin
 
 	var request_body = {
 		"agent_type": agent_type,
-		"message": message
+		"message": message,
+		"session_id": session_id
 	}
 
 	if poster_id != "":
@@ -7,63 +7,76 @@ This script:
 3. Updates posters.json with the extracted metadata
 
 Requirements:
-    pip install pdf2image pypdf pillow
-
-    On macOS: brew install poppler
-    On Linux: sudo apt-get install poppler-utils
-    On Windows: Download poppler binaries
+    pip install pymupdf pyyaml orjson
 """
 
-import json
+import base64
+import hashlib
+import importlib.util
+import mmap
+import os
 import re
+import shutil
+from contextlib import nullcontext
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional
 import argparse
 
-try:
-    from pdf2image import convert_from_path
-    from PIL import Image
-    import PyPDF2
-    import yaml
-except ImportError:
+# pymupdf, yaml and requests are slow to import, so they are imported in the
+# functions that use them; here we only check that they're installed
+if any(importlib.util.find_spec(name) is None for name in ("orjson", "pymupdf", "yaml")):
     print("Error: Missing required packages")
-    print("Install with: pixi add pyyaml")
-    print("Or: pip install pdf2image pypdf pillow pyyaml")
-    print("\nAlso install poppler:")
-    print("  macOS: brew install poppler")
-    print("  Linux: sudo apt-get install poppler-utils")
+    print("Install with: pixi install")
+    print("Or: pip install pymupdf pyyaml orjson")
     exit(1)
 
+import orjson
+
+from poster_common import (
+    OLLAMA_URL, copy_file_atomic, get_ollama_session, load_checkpoint, load_overrides,
+    open_checkpoint, write_bytes_atomic
+)
+
 # Optional: vision-based extraction
-try:
-    import requests
-    import base64
-    VISION_AVAILABLE = True
-except ImportError:
-    VISION_AVAILABLE = False
+VISION_AVAILABLE = importlib.util.find_spec("requests") is not None
+
+# Poster PNG resolution: rendered at PNG_DPI, capped at PNG_MAX_WIDTH pixels wide
+PNG_DPI = 150
+PNG_MAX_WIDTH = 1200
 
+# Rendered PNGs and extracted text are cached here, inside the image output
+# directory, keyed by the PDF's content hash
+CACHE_DIR_NAME = ".cache"
+
+# Width of the image sent to the vision model; larger images are downscaled
+# by the model anyway, so rendering more pixels only costs encode time
+VISION_IMAGE_WIDTH = 1024
+
+# Pages whose text is parsed for metadata; the title and authors are on the
+# first page and later pages are usually supplementary slides
+TEXT_PAGES = 1
+
+# Posters with less text than this are treated as image-only (scanned)
+MIN_TEXT_CHARS = 50
 
 def check_ollama_available() -> bool:
     """Check if Ollama is running."""
     if not VISION_AVAILABLE:
         return False
     try:
-        response = requests.get("http://localhost:11434/api/tags", timeout=2)
+        response = get_ollama_session().get(f"{OLLAMA_URL}/api/tags", timeout=2)
         return response.status_code == 200
     except:
         return False
 
 
-def extract_metadata_with_vision(image_path: Path, model: str = "gemma3:latest") -> Optional[Dict]:
-    """Use Ollama vision model to extract metadata from poster image."""
+def extract_metadata_with_vision(image_base64: str, model: str = "gemma3:latest") -> Optional[Dict]:
+    """Use Ollama vision model to extract metadata from a base64-encoded PNG of the poster."""
     if not VISION_AVAILABLE:
         return None
 
     try:
-        # Encode image
-        with open(image_path, "rb") as image_file:
-            image_base64 = base64.b64encode(image_file.read()).decode("utf-8")
-
         # Prompt for structured extraction
         prompt = """You are analyzing a research poster image. Extract the following information in JSON format:
 
@@ -84,59 +97,145 @@ Rules:
 Analyze this poster:"""
 
         # Call Ollama API
-        response = requests.post(
-            "http://localhost:11434/api/generate",
-            json={
+        response = get_ollama_session().post(
+            f"{OLLAMA_URL}/api/generate",
+            data=orjson.dumps({
                 "model": model,
                 "prompt": prompt,
                 "images": [image_base64],
                 "stream": False,
                 "format": "json"
-            },
+            }),
             timeout=60
         )
 
         if response.status_code != 200:
             return None
 
-        result = response.json()
-        response_text = result.get("response", "")
+        response_text = orjson.loads(response.content).get("response", "")
 
         # Parse JSON
-        return json.loads(response_text)
+        return orjson.loads(response_text)
 
     except Exception as e:
         print(f"  Vision extraction error: {e}")
         return None
 
 
-def load_overrides(overrides_file: Path) -> Dict:
-    """Load manual overrides from YAML file."""
-    if not overrides_file.exists():
-        return {}
+def extract_metadata_with_vision_cached(
+    image_base64: str,
+    model: str,
+    cache_dir: Optional[Path]
+) -> Optional[Dict]:
+    """
+    extract_metadata_with_vision, reusing the stored result when the same
+    image was already sent to the same model. cache_dir=None disables caching.
+    """
+    if cache_dir is None:
+        return extract_metadata_with_vision(image_base64, model)
+
+    key = hashlib.sha256(f"{model}\n{image_base64}".encode("ascii")).hexdigest()
+    cached = cache_dir / f"{key}.vision.json"
+    if cached.exists():
+        try:
+            return orjson.loads(cached.read_bytes())
+        except (OSError, orjson.JSONDecodeError) as e:
+            # A damaged entry is a cache miss; it is overwritten below
+            print(f"  Warning: Ignoring unreadable vision cache entry {cached.name}: {e}")
+
+    metadata = extract_metadata_with_vision(image_base64, model)
+    if metadata:
+        try:
+            write_bytes_atomic(cached, orjson.dumps(metadata))
+        except OSError as e:
+            print(f"  Warning: Could not cache vision result: {e}")
+    return metadata
 
-    try:
-        with open(overrides_file, 'r') as f:
-            overrides = yaml.safe_load(f) or {}
-        print(f"Loaded {len(overrides)} overrides from {overrides_file}")
-        return overrides
-    except Exception as e:
-        print(f"Warning: Could not load overrides: {e}")
-        return {}
 
+def open_pdf(pdf_path: Path, doc=None):
+    """Context manager for a PDF: reuses an already open doc, else opens (and closes) the file."""
+    import pymupdf
 
-def extract_text_from_pdf(pdf_path: Path) -> str:
-    """Extract all text from a PDF file."""
+    return nullcontext(doc) if doc is not None else pymupdf.open(str(pdf_path))
+
+
+def extract_text_from_pdf(pdf_path: Path, max_pages: int = TEXT_PAGES, doc=None) -> Optional[str]:
+    """Extract the text of the first max_pages pages of a PDF file (None on error)."""
     try:
-        with open(pdf_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-            return text
+        with open_pdf(pdf_path, doc) as doc:
+            pages = range(min(max_pages, doc.page_count))
+            return "".join(doc[i].get_text("text") + "\n" for i in pages)
     except Exception as e:
         print(f"Error extracting text from {pdf_path}: {e}")
-        return ""
+        return None
+
+
+# Lines that are institution headers, page numbers etc. rather than titles
+_SKIP_RE = re.compile(
+    r'rise.*research.*institute|university|department|page \d+|^\d+$',
+    re.IGNORECASE
+)
+
+# Heading words that introduce the abstract
+_ABSTRACT_RE = re.compile(r'\b(?:abstract|summary|introduction)\b', re.IGNORECASE)
+
+# Separators between author names on a line: commas, semicolons, '&',
+# a whole-word "and" (not the one inside "Anderson") and runs of spaces
+_AUTHOR_SPLIT_RE = re.compile(r'[,;&]|\band\b|\s{2,}')
+
+# Affiliation markers after a name, e.g. "Erik Berg1" or "Anna Lind*"
+_AUTHOR_MARK_RE = re.compile(r'[\d*†‡]+(?=\s|$)')
+
+# One word of a name: letters in any script, optionally joined by hyphens
+# or apostrophes ("Berg-Lind", "O'Brien"), or an initial ("J.")
+_NAME_WORD_RE = re.compile(r"[^\W\d_]+(?:[-'’][^\W\d_]+)*\.?")
+
+# Lowercase particles that may appear inside a name ("Anna van der Berg")
+_NAME_PARTICLES = frozenset({
+    'af', 'al', 'bin', 'da', 'de', 'del', 'della', 'den', 'der', 'di', 'du',
+    'la', 'le', 'ten', 'ter', 'van', 'von', 'zu',
+})
+
+
+def looks_like_name(candidate: str) -> bool:
+    """Whether a piece of an author line is a person's name, in any script."""
+    words = candidate.split()
+    if not 2 <= len(words) <= 6 or words[-1] in _NAME_PARTICLES:
+        return False
+    return all(
+        _NAME_WORD_RE.fullmatch(word) and (not word[0].islower() or word in _NAME_PARTICLES)
+        for word in words
+    )
+
+
+# Keywords that map poster text to tags (very basic)
+_TAG_KEYWORDS = {
+    'ai': 'artificial-intelligence',
+    'machine learning': 'machine-learning',
+    'deep learning': 'deep-learning',
+    'neural network': 'neural-networks',
+    'robot': 'robotics',
+    'iot': 'iot',
+    'edge': 'edge-computing',
+    'security': 'security',
+    'privacy': 'privacy',
+    'healthcare': 'healthcare',
+    'medical': 'healthcare',
+    'sustainable': 'sustainability',
+    'energy': 'energy',
+    'quantum': 'quantum-computing',
+    'federated': 'federated-learning',
+    'computer vision': 'computer-vision',
+    'nlp': 'nlp',
+    'natural language': 'nlp',
+}
+
+# All keywords in one case-insensitive regex; the lookahead reports
+# overlapping matches too
+_TAG_KEYWORD_RE = re.compile(
+    '(?=(' + '|'.join(re.escape(k) for k in sorted(_TAG_KEYWORDS, key=len, reverse=True)) + '))',
+    re.IGNORECASE
+)
 
 
 def extract_title_smartly(lines: List[str], poster_id: str) -> str:
@@ -147,17 +246,9 @@ def extract_title_smartly(lines: List[str], poster_id: str) -> str:
         return f"Research Poster {poster_id}"
 
     # Strategy 1: Skip common headers/footers
-    skip_patterns = [
-        r'rise.*research.*institute',
-        r'university',
-        r'department',
-        r'page \d+',
-        r'^\d+$',  # Just numbers
-    ]
-
     for i, line in enumerate(lines[:10]):  # Check first 10 lines
         # Skip if matches skip patterns
-        if any(re.search(pattern, line, re.IGNORECASE) for pattern in skip_patterns):
+        if _SKIP_RE.search(line):
             continue
 
         # Skip very short lines (likely not titles)
@@ -186,6 +277,16 @@ def extract_title_smartly(lines: List[str], poster_id: str) -> str:
     return f"Research Poster {poster_id}"
 
 
+def default_poster_content(poster_id: str) -> Dict:
+    """Placeholder metadata for a poster with no usable text."""
+    return {
+        'title': f"Research Poster {poster_id}",
+        'authors': ["Unknown Author"],
+        'abstract': "Research poster content extracted from PDF.",
+        'tags': ['research', 'computer-science']
+    }
+
+
 def parse_poster_content(text: str, poster_id: str, pdf_filename: str = "") -> Dict:
     """
     Parse extracted text to find title, authors, abstract, etc.
@@ -200,70 +301,52 @@ def parse_poster_content(text: str, poster_id: str, pdf_filename: str = "") -> D
     # Look for common patterns
     authors = []
     abstract = ""
-    tags = []
 
     # Simple heuristic: authors often appear in first few lines
     # Look for names (capitalized words with possible middle initials)
     for i, line in enumerate(lines[1:5], 1):
-        # Check if line looks like author names (has capitalized words, commas, etc.)
-        if re.search(r'[A-Z][a-z]+.*[A-Z][a-z]+', line) and len(line) < 100:
-            # Split by common separators
-            author_candidates = re.split(r',|and|\s{2,}', line)
-            authors.extend([a.strip() for a in author_candidates if a.strip()])
+        # Short lines may hold author names; split them and keep the name-like pieces
+        if len(line) < 100:
+            candidates = (_AUTHOR_MARK_RE.sub('', piece).strip()
+                          for piece in _AUTHOR_SPLIT_RE.split(line))
+            authors.extend(name for name in candidates if looks_like_name(name))
 
     if not authors:
         authors = ["Unknown Author"]
 
-    # Look for abstract/summary section
-    abstract_keywords = ['abstract', 'summary', 'introduction']
+    # Look for the abstract/summary heading and, in case it yields nothing,
+    # the first substantial paragraph, in a single pass over the lines
+    abstract_start = None
+    fallback_line = None
     for i, line in enumerate(lines):
-        if any(keyword in line.lower() for keyword in abstract_keywords):
-            # Take next few lines as abstract
-            abstract_lines = []
-            for j in range(i+1, min(i+10, len(lines))):
-                if len(lines[j]) > 20:  # Skip short lines
-                    abstract_lines.append(lines[j])
-                if len(' '.join(abstract_lines)) > 300:  # Limit length
-                    break
-            abstract = ' '.join(abstract_lines)
+        if abstract_start is None and _ABSTRACT_RE.search(line):
+            abstract_start = i
+        if fallback_line is None and i >= 2 and len(line) > 100:
+            fallback_line = line
+        if abstract_start is not None and fallback_line is not None:
             break
 
-    if not abstract:
-        # Fallback: use first substantial paragraph
-        for line in lines[2:]:
-            if len(line) > 100:
-                abstract = line[:400] + "..." if len(line) > 400 else line
+    if abstract_start is not None:
+        # Take next few lines as abstract
+        abstract_lines = []
+        for j in range(abstract_start + 1, min(abstract_start + 10, len(lines))):
+            if len(lines[j]) > 20:  # Skip short lines
+                abstract_lines.append(lines[j])
+            if len(' '.join(abstract_lines)) > 300:  # Limit length
                 break
+        abstract = ' '.join(abstract_lines)
+
+    if not abstract and fallback_line:
+        # Fallback: use first substantial paragraph
+        abstract = fallback_line[:400] + "..." if len(fallback_line) > 400 else fallback_line
 
     if not abstract:
         abstract = "Research poster content extracted from PDF."
 
-    # Try to infer tags from text (very basic)
-    tech_keywords = {
-        'ai': 'artificial-intelligence',
-        'machine learning': 'machine-learning',
-        'deep learning': 'deep-learning',
-        'neural network': 'neural-networks',
-        'robot': 'robotics',
-        'iot': 'iot',
-        'edge': 'edge-computing',
-        'security': 'security',
-        'privacy': 'privacy',
-        'healthcare': 'healthcare',
-        'medical': 'healthcare',
-        'sustainable': 'sustainability',
-        'energy': 'energy',
-        'quantum': 'quantum-computing',
-        'federated': 'federated-learning',
-        'computer vision': 'computer-vision',
-        'nlp': 'nlp',
-        'natural language': 'nlp',
-    }
-
-    text_lower = text.lower()
-    for keyword, tag in tech_keywords.items():
-        if keyword in text_lower and tag not in tags:
-            tags.append(tag)
+    # Try to infer tags from text (very basic), in one pass over the text
+    found = {match.group(1).lower() for match in _TAG_KEYWORD_RE.finditer(text)}
+    # dict.fromkeys drops duplicate tags while keeping the table order
+    tags = list(dict.fromkeys(tag for keyword, tag in _TAG_KEYWORDS.items() if keyword in found))
 
     if not tags:
         tags = ['research', 'computer-science']
@@ -276,30 +359,46 @@ def parse_poster_content(text: str, poster_id: str, pdf_filename: str = "") -> D
     }
 
 
-def pdf_to_png(pdf_path: Path, output_path: Path, dpi: int = 150) -> bool:
+def pdf_content_hash(pdf_path: Path) -> str:
+    """SHA-256 of a PDF's bytes, used as its cache key."""
+    with open(pdf_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return hashlib.sha256().hexdigest()
+        # Hash straight from the page cache instead of reading large scans into memory
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return hashlib.sha256(mapped).hexdigest()
+
+
+def pdf_to_png(
+    pdf_path: Path,
+    output_path: Path,
+    dpi: int = PNG_DPI,
+    max_width: int = PNG_MAX_WIDTH,
+    doc=None
+) -> bool:
     """Convert PDF poster to PNG image."""
+    import pymupdf
+
     try:
         print(f"Converting {pdf_path.name} to PNG...")
 
-        # Convert PDF to images (usually just first page for posters)
-        images = convert_from_path(str(pdf_path), dpi=dpi, first_page=1, last_page=1)
+        with open_pdf(pdf_path, doc) as doc:
+            if doc.page_count == 0:
+                print(f"  Error: No images generated from {pdf_path}")
+                return False
 
-        if not images:
-            print(f"  Error: No images generated from {pdf_path}")
-            return False
+            # Render the first (and usually only) page
+            page = doc.load_page(0)
 
-        # Get the first (and usually only) page
-        image = images[0]
+            # Scale to the requested DPI, capped at a standard width, so the
+            # page is rasterized at its final size with no separate resize
+            zoom = dpi / 72
+            if page.rect.width * zoom > max_width:
+                zoom = max_width / page.rect.width
 
-        # Optionally resize to standard size
-        max_width = 1200
-        if image.width > max_width:
-            ratio = max_width / image.width
-            new_size = (max_width, int(image.height * ratio))
-            image = image.resize(new_size, Image.Resampling.LANCZOS)
+            pixmap = page.get_pixmap(matrix=pymupdf.Matrix(zoom, zoom), alpha=False)
+            pixmap.save(str(output_path))
 
-        # Save as PNG
-        image.save(output_path, 'PNG', optimize=True)
         print(f"  ✓ Saved to {output_path}")
         return True
 
@@ -308,6 +407,218 @@ def pdf_to_png(pdf_path: Path, output_path: Path, dpi: int = 150) -> bool:
         return False
 
 
+def pdf_to_vision_png(
+    pdf_path: Path,
+    width: int = VISION_IMAGE_WIDTH,
+    doc=None
+) -> Optional[bytes]:
+    """Render a PDF's first page in memory at the vision model's input width."""
+    import pymupdf
+
+    try:
+        with open_pdf(pdf_path, doc) as doc:
+            if doc.page_count == 0:
+                return None
+            page = doc.load_page(0)
+            zoom = width / page.rect.width
+            pixmap = page.get_pixmap(matrix=pymupdf.Matrix(zoom, zoom), alpha=False)
+            return pixmap.tobytes("png")
+    except Exception as e:
+        print(f"  Error rendering {pdf_path} for vision: {e}")
+        return None
+
+
+def render_and_parse_pdf(
+    pdf_path: Path,
+    idx: int,
+    output_images_dir: Path,
+    use_cache: bool = True,
+    use_vision: bool = False,
+    text_pages: int = TEXT_PAGES
+) -> Dict:
+    """
+    Run _render_and_parse_pdf for one PDF in a worker process.
+
+    Any failure (an unreadable file, a full disk while caching, ...) is
+    reported for this PDF only and yields placeholder metadata, so it
+    never reaches the caller and stops the remaining posters.
+    """
+    try:
+        return _render_and_parse_pdf(
+            pdf_path, idx, output_images_dir, use_cache, use_vision, text_pages
+        )
+    except Exception as e:
+        print(f"  Error processing {pdf_path}: {e}")
+        return {
+            'png_path': None,
+            'vision_image': None,
+            'content': default_poster_content(f"poster_{idx:03d}")
+        }
+
+
+def _render_and_parse_pdf(
+    pdf_path: Path,
+    idx: int,
+    output_images_dir: Path,
+    use_cache: bool = True,
+    use_vision: bool = False,
+    text_pages: int = TEXT_PAGES
+) -> Dict:
+    """
+    First stage: rasterize a PDF to PNG and parse its text.
+
+    This is the CPU-bound part of the work and runs in worker processes.
+    With use_cache, a PDF whose content was seen before reuses the stored
+    PNG and text instead of being rendered and extracted again. With
+    use_vision, a smaller in-memory PNG for the vision model is rendered too.
+    Only the first text_pages pages are read for text.
+    """
+    poster_id = f"poster_{idx:03d}"
+    print(f"\nProcessing {pdf_path.name} → {poster_id}")
+
+    png_path = output_images_dir / f"{poster_id}.png"
+
+    if use_cache:
+        cache_dir = output_images_dir / CACHE_DIR_NAME
+        cache_dir.mkdir(exist_ok=True)
+        digest = pdf_content_hash(pdf_path)
+        cached_png = cache_dir / f"{digest}_{PNG_DPI}_{PNG_MAX_WIDTH}.png"
+        cached_text = cache_dir / f"{digest}_{text_pages}p.txt"
+
+    png_cached = use_cache and cached_png.exists()
+    text_cached = use_cache and cached_text.exists()
+
+    # Open the PDF once and share it between rendering and text extraction
+    doc = None
+    if use_vision or not (png_cached and text_cached):
+        import pymupdf
+
+        try:
+            doc = pymupdf.open(str(pdf_path))
+        except Exception:
+            # The helpers below open it themselves and report the error
+            pass
+
+    try:
+        if png_cached:
+            shutil.copyfile(cached_png, png_path)
+            print(f"  ✓ Reused cached PNG for {pdf_path.name}")
+            success = True
+        else:
+            success = pdf_to_png(pdf_path, png_path, doc=doc)
+            if success and use_cache:
+                # Cache entries are only checked with exists(), so never
+                # leave a partial one behind if the run is interrupted
+                copy_file_atomic(png_path, cached_png)
+
+        if not success:
+            print(f"  Warning: PNG conversion failed")
+
+        if text_cached:
+            text = cached_text.read_text(encoding='utf-8')
+        else:
+            text = extract_text_from_pdf(pdf_path, text_pages, doc)
+            if text is None:
+                # Don't cache a failed extraction, or later runs would
+                # silently reuse the empty text
+                text = ""
+            elif use_cache:
+                write_bytes_atomic(cached_text, text.encode('utf-8'))
+        if len(text.strip()) < MIN_TEXT_CHARS:
+            # Image-only (scanned) poster: nothing for the text heuristics to parse
+            hint = "" if use_vision else " (try --use-vision)"
+            print(f"  Warning: No usable text, poster looks image-only; using defaults{hint}")
+            content = default_poster_content(poster_id)
+        else:
+            content = parse_poster_content(text, poster_id, pdf_path.stem)
+
+        # Ollama only takes images base64-encoded in the JSON body, so encode
+        # here in the worker rather than on the thread sending the request
+        vision_image = None
+        if use_vision:
+            vision_png = pdf_to_vision_png(pdf_path, doc=doc)
+            if vision_png:
+                vision_image = base64.b64encode(vision_png).decode("ascii")
+    finally:
+        if doc is not None:
+            doc.close()
+
+    return {
+        'png_path': png_path if success else None,
+        'vision_image': vision_image,
+        'content': content
+    }
+
+
+def build_poster_entry(
+    pdf_path: Path,
+    idx: int,
+    rendered: Dict,
+    overrides: Optional[Dict] = None,
+    use_vision: bool = False,
+    vision_metadata: Optional[Dict] = None
+) -> Dict:
+    """
+    Second stage: pick vision or parsed metadata, apply overrides, build the entry.
+
+    Args:
+        pdf_path: Source PDF
+        idx: Poster number
+        rendered: Result of render_and_parse_pdf for this PDF
+        overrides: Manual overrides keyed by PDF basename
+        use_vision: Whether vision extraction was requested
+        vision_metadata: Result of the vision call, None if it failed
+    """
+    poster_id = f"poster_{idx:03d}"
+    pdf_basename = pdf_path.stem  # filename without .pdf
+    content = rendered['content']
+
+    # Prefer vision metadata when enabled; text parsing is the fallback
+    if use_vision:
+        print(f"\n{poster_id}: vision model metadata")
+        if vision_metadata:
+            content = vision_metadata
+            print(f"  ✓ Vision extraction successful")
+            print(f"  Title: {content.get('title', 'N/A')[:60]}")
+        else:
+            print(f"  ⚠ Vision extraction failed, falling back to text parsing")
+
+    # Apply manual overrides if available
+    override = overrides.get(pdf_basename) if overrides else None
+    if override:
+        # Copy rather than update, so the extracted metadata kept in the
+        # checkpoint stays free of overrides
+        content = {**content, **override}
+        if 'title' in override:
+            print(f"  ✓ Applied title override: {override['title']}")
+
+    # Create poster metadata
+    poster = {
+        'id': poster_id,
+        'title': content['title'],
+        'authors': content['authors'],
+        'tags': content['tags'],
+        'room': 'corridor',  # Default, can customize
+        'booth_id': f'booth_{idx}',
+        'abstract': content['abstract'],
+        'poster_image': f'res://assets/posters/{poster_id}.png',
+        'source_pdf': pdf_path.name,
+        'faq': [
+            {
+                'question': 'Where can I read more?',
+                'answer': 'Please refer to the full paper or contact the authors for more details.'
+            }
+        ]
+    }
+
+    print(f"  ✓ Metadata extracted for {poster_id}:")
+    print(f"    Title: {content['title'][:50]}...")
+    print(f"    Authors: {', '.join(content['authors'])}")
+    print(f"    Tags: {', '.join(content['tags'])}")
+
+    return poster
+
+
 def process_poster_pdfs(
     pdf_dir: Path,
     output_json: Path,
@@ -315,9 +626,20 @@ def process_poster_pdfs(
     start_id: int = 1,
     overrides: Optional[Dict] = None,
     use_vision: bool = False,
-    vision_model: str = "gemma3:latest"
+    vision_model: str = "gemma3:latest",
+    vision_concurrency: int = 4,
+    use_cache: bool = True,
+    text_pages: int = TEXT_PAGES
 ) -> List[Dict]:
-    """Process all PDFs in a directory."""
+    """
+    Process all PDFs in a directory.
+
+    The extracted metadata of each finished PDF is appended to a JSONL
+    checkpoint next to output_json. If a previous run with the same
+    settings was interrupted, its checkpointed PDFs are not processed
+    again; overrides are applied to them afresh, so edits made to
+    poster_overrides.yaml in between take effect.
+    """
 
     pdf_files = sorted(pdf_dir.glob("*.pdf"))
 
@@ -329,86 +651,95 @@ def process_poster_pdfs(
     if overrides:
         print(f"Using {len(overrides)} manual overrides")
     if use_vision:
-        print(f"Using vision model: {vision_model}")
+        print(f"Using vision model: {vision_model} ({vision_concurrency} concurrent requests)")
     print("=" * 60)
 
-    posters = []
-
-    for idx, pdf_path in enumerate(pdf_files, start=start_id):
-        poster_id = f"poster_{idx:03d}"
-        pdf_basename = pdf_path.stem  # filename without .pdf
-        print(f"\nProcessing {pdf_path.name} → {poster_id}")
+    indices = range(start_id, start_id + len(pdf_files))
 
-        # Convert to PNG first (needed for both modes)
-        png_path = output_images_dir / f"{poster_id}.png"
-        success = pdf_to_png(pdf_path, png_path)
+    # Resume an interrupted run: a checkpointed PDF is skipped when it was
+    # extracted with the same settings and got the same id it would get now
+    settings = {
+        'use_vision': use_vision,
+        'vision_model': vision_model if use_vision else None,
+        'text_pages': text_pages,
+    }
+    checkpoint_file = output_json.with_suffix('.jsonl')
+    checkpointed = load_checkpoint(checkpoint_file, 'source_pdf')
+    resumed = {}
+    for pdf_path, idx in zip(pdf_files, indices):
+        record = checkpointed.get(pdf_path.name)
+        if (record and record.get('id') == f"poster_{idx:03d}"
+                and record.get('settings') == settings):
+            resumed[pdf_path.name] = record
+    if checkpointed:
+        print(f"Resuming from {checkpoint_file}: reusing {len(resumed)} posters "
+              f"(delete it to start over)")
+        if len(resumed) < len(checkpointed):
+            print(f"  {len(checkpointed) - len(resumed)} checkpointed posters were made with "
+                  f"other settings or ids and will be extracted again")
+
+    pending = [
+        (pdf_path, idx) for pdf_path, idx in zip(pdf_files, indices)
+        if pdf_path.name not in resumed
+    ]
+    workers = max(1, min(os.cpu_count() or 1, len(pending)))
 
-        if not success:
-            print(f"  Warning: PNG conversion failed")
+    def vision_for(rendering: Future) -> Optional[Dict]:
+        """Wait for a poster's vision image, then ask the vision model about it."""
+        vision_image = rendering.result()['vision_image']
+        if not vision_image:
+            return None
+        cache_dir = output_images_dir / CACHE_DIR_NAME if use_cache else None
+        return extract_metadata_with_vision_cached(vision_image, vision_model, cache_dir)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor, \
+            ThreadPoolExecutor(max_workers=max(1, vision_concurrency)) as vision_pool:
+        # Queue every PDF for rendering up front; the workers keep rasterizing
+        # later posters while the vision calls for earlier ones are in flight
+        rendering = [
+            executor.submit(
+                render_and_parse_pdf, pdf_path, idx, output_images_dir,
+                use_cache, use_vision, text_pages
+            )
+            for pdf_path, idx in pending
+        ]
+
+        # Each vision call starts as soon as its PNG is ready, with up to
+        # vision_concurrency requests sharing the keep-alive session
+        vision = [
+            vision_pool.submit(vision_for, future) if use_vision else None
+            for future in rendering
+        ]
+
+        # Append each PDF's extracted metadata to the JSONL checkpoint as it
+        # completes, so a crash mid-run still leaves that work on disk. The
+        # metadata is stored before overrides, which are applied on resume
+        new_posters = {}
+        with open_checkpoint(checkpoint_file) as checkpoint:
+            for (pdf_path, idx), future, vision_future in zip(pending, rendering, vision):
+                rendered = future.result()
+                vision_metadata = vision_future.result() if vision_future else None
+                new_posters[pdf_path.name] = build_poster_entry(
+                    pdf_path, idx, rendered, overrides, use_vision, vision_metadata
+                )
+                checkpoint.write(orjson.dumps({
+                    'source_pdf': pdf_path.name,
+                    'id': f"poster_{idx:03d}",
+                    'settings': settings,
+                    'content': rendered['content'],
+                    'vision_metadata': vision_metadata,
+                }) + b'\n')
+                checkpoint.flush()
 
-        # Extract metadata - use vision if enabled, otherwise text parsing
-        if use_vision and success:
-            print(f"  Using vision model to extract metadata...")
-            vision_metadata = extract_metadata_with_vision(png_path, vision_model)
-            if vision_metadata:
-                content = vision_metadata
-                print(f"  ✓ Vision extraction successful")
-                print(f"  Title: {content.get('title', 'N/A')[:60]}")
-            else:
-                print(f"  ⚠ Vision extraction failed, falling back to text parsing")
-                text = extract_text_from_pdf(pdf_path)
-                content = parse_poster_content(text, poster_id, pdf_basename)
+    posters = []
+    for pdf_path, idx in zip(pdf_files, indices):
+        record = resumed.get(pdf_path.name)
+        if record:
+            posters.append(build_poster_entry(
+                pdf_path, idx, record, overrides, use_vision, record['vision_metadata']
+            ))
         else:
-            # Traditional text extraction
-            text = extract_text_from_pdf(pdf_path)
-            if not text:
-                print(f"  Warning: No text extracted, using defaults")
-            content = parse_poster_content(text, poster_id, pdf_basename)
-
-        # Apply manual overrides if available
-        if overrides and pdf_basename in overrides:
-            override = overrides[pdf_basename]
-            if isinstance(override, str):
-                # Simple case: just a title override
-                content['title'] = override
-                print(f"  ✓ Applied title override: {override}")
-            elif isinstance(override, dict):
-                # Full override with multiple fields
-                if 'title' in override:
-                    content['title'] = override['title']
-                    print(f"  ✓ Applied title override: {override['title']}")
-                if 'authors' in override:
-                    content['authors'] = override['authors']
-                if 'tags' in override:
-                    content['tags'] = override['tags']
-                if 'abstract' in override:
-                    content['abstract'] = override['abstract']
-
-        # Create poster metadata
-        poster = {
-            'id': poster_id,
-            'title': content['title'],
-            'authors': content['authors'],
-            'tags': content['tags'],
-            'room': 'corridor',  # Default, can customize
-            'booth_id': f'booth_{idx}',
-            'abstract': content['abstract'],
-            'poster_image': f'res://assets/posters/{poster_id}.png',
-            'source_pdf': pdf_path.name,
-            'faq': [
-                {
-                    'question': 'Where can I read more?',
-                    'answer': 'Please refer to the full paper or contact the authors for more details.'
-                }
-            ]
-        }
-
-        posters.append(poster)
-
-        print(f"  ✓ Metadata extracted:")
-        print(f"    Title: {content['title'][:50]}...")
-        print(f"    Authors: {', '.join(content['authors'])}")
-        print(f"    Tags: {', '.join(content['tags'])}")
+            posters.append(new_posters[pdf_path.name])
 
     print("\n" + "=" * 60)
     print(f"✓ Processed {len(posters)} posters")
@@ -459,6 +790,23 @@ def main():
         default='gemma3:latest',
         help='Vision model to use with Ollama (default: gemma3:latest)'
     )
+    parser.add_argument(
+        '--vision-concurrency',
+        type=int,
+        default=4,
+        help='Concurrent vision requests sent to Ollama (default: 4, see OLLAMA_NUM_PARALLEL)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Re-render and re-extract every PDF instead of reusing cached output'
+    )
+    parser.add_argument(
+        '--text-pages',
+        type=int,
+        default=TEXT_PAGES,
+        help='Number of leading pages to read text from (default: 1)'
+    )
 
     args = parser.parse_args()
 
@@ -507,7 +855,10 @@ def main():
         args.start_id,
         overrides,
         use_vision=args.use_vision,
-        vision_model=args.vision_model
+        vision_model=args.vision_model,
+        vision_concurrency=args.vision_concurrency,
+        use_cache=not args.no_cache,
+        text_pages=args.text_pages
     )
 
     if not new_posters:
@@ -518,8 +869,7 @@ def main():
     existing_posters = []
     if args.merge and output_json.exists():
         try:
-            with open(output_json, 'r') as f:
-                existing_posters = json.load(f)
+            existing_posters = orjson.loads(output_json.read_bytes())
             print(f"\nMerging with {len(existing_posters)} existing posters")
         except Exception as e:
             print(f"Warning: Could not load existing posters: {e}")
@@ -527,9 +877,9 @@ def main():
     # Combine posters
     all_posters = existing_posters + new_posters
 
-    # Save to JSON
-    with open(output_json, 'w') as f:
-        json.dump(all_posters, f, indent=2)
+    # Save to JSON; the checkpoint is no longer needed once this succeeds
+    output_json.write_bytes(orjson.dumps(all_posters, option=orjson.OPT_INDENT_2))
+    output_json.with_suffix('.jsonl').unlink(missing_ok=True)
 
     print(f"\n✓ Saved {len(all_posters)} posters to {output_json}")
     print(f"✓ Saved {len(new_posters)} images to {output_images_dir}")
@@ -20,6 +20,11 @@ from pathlib import Path
 from typing import Dict, List, Optional, Any
 import sys
 
+try:
+    import orjson
+except ImportError:  # optional; the standard json module is used without it
+    orjson = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -35,7 +40,7 @@ class PosterMetadataManager:
     PRESERVE_FIELDS = {'faq', 'booth_id', 'room', 'related_links'}
 
     # Required fields for minimal poster entry
-    REQUIRED_FIELDS = {'id', 'title', 'authors', 'tags', 'abstract', 'poster_image'}
+    REQUIRED_FIELDS = frozenset({'id', 'title', 'authors', 'tags', 'abstract', 'poster_image'})
 
     def __init__(self, backend_dir: Path):
         self.backend_dir = backend_dir
@@ -53,33 +58,46 @@ class PosterMetadataManager:
             }
 
         try:
-            with open(self.posters_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                logger.info(f"Loaded {len(data.get('posters', []))} existing posters")
-                return data
-        except json.JSONDecodeError as e:
+            if orjson is not None:
+                data = orjson.loads(self.posters_file.read_bytes())
+            else:
+                with open(self.posters_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            logger.info(f"Loaded {len(data.get('posters', []))} existing posters")
+            return data
+        except json.JSONDecodeError as e:  # orjson.JSONDecodeError subclasses it
             logger.error(f"Error parsing existing posters.json: {e}")
             raise
 
-    def save_posters(self, data: Dict[str, Any]) -> None:
+    def save_posters(self, data: Dict[str, Any], now: Optional[str] = None) -> None:
         """Save posters data to posters.json with proper formatting."""
-        data['last_updated'] = datetime.now().isoformat()
+        data['last_updated'] = now or datetime.now().isoformat()
 
-        with open(self.posters_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        if orjson is not None:
+            self.posters_file.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(self.posters_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
 
         logger.info(f"Saved {len(data['posters'])} posters to {self.posters_file}")
 
-    def merge_poster(self, existing: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    def merge_poster(
+        self,
+        existing: Dict[str, Any],
+        new: Dict[str, Any],
+        now: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
-        Merge new poster data with existing, preserving manually curated fields.
+        Merge new poster data into existing, preserving manually curated fields.
+
+        The existing entry is updated in place and returned.
 
         Strategy:
         - Update basic fields (title, abstract, authors, tags) from new data
         - Preserve manually added fields (faq, booth_id, etc.)
         - Track update timestamp in metadata
         """
-        merged = existing.copy()
+        merged = existing
 
         # Update basic fields from new data
         for field in ['title', 'abstract', 'authors', 'tags', 'poster_image',
@@ -100,7 +118,7 @@ class PosterMetadataManager:
         if 'metadata' not in merged:
             merged['metadata'] = {}
 
-        merged['metadata']['updated_at'] = datetime.now().isoformat()
+        merged['metadata']['updated_at'] = now or datetime.now().isoformat()
 
         # Preserve original creation time
         if 'metadata' in existing and 'created_at' in existing['metadata']:
@@ -112,12 +130,12 @@ class PosterMetadataManager:
         logger.info(f"Merged poster '{merged.get('title', merged.get('id'))}'")
         return merged
 
-    def add_poster(self, poster: Dict[str, Any]) -> Dict[str, Any]:
+    def add_poster(self, poster: Dict[str, Any], now: Optional[str] = None) -> Dict[str, Any]:
         """Add metadata tracking to a new poster."""
         if 'metadata' not in poster:
             poster['metadata'] = {}
 
-        now = datetime.now().isoformat()
+        now = now or datetime.now().isoformat()
         poster['metadata']['created_at'] = now
         poster['metadata']['updated_at'] = now
 
@@ -127,11 +145,19 @@ class PosterMetadataManager:
         logger.info(f"Added new poster '{poster.get('title', poster.get('id'))}'")
         return poster
 
-    def validate_poster(self, poster: Dict[str, Any]) -> bool:
-        """Validate that a poster has all required fields."""
-        missing = self.REQUIRED_FIELDS - set(poster.keys())
+    def validate_poster(self, poster: Dict[str, Any], errors: Optional[List[str]] = None) -> bool:
+        """
+        Validate that a poster has all required fields.
+
+        Problems are logged, or appended to errors instead when a list is given.
+        """
+        missing = self.REQUIRED_FIELDS.difference(poster)
         if missing:
-            logger.error(f"Poster {poster.get('id', 'unknown')} missing required fields: {missing}")
+            error = f"{poster.get('id', 'unknown')} missing {sorted(missing)}"
+            if errors is None:
+                logger.error("Poster %s", error)
+            else:
+                errors.append(error)
             return False
         return True
 
@@ -146,21 +172,47 @@ class PosterMetadataManager:
         posters = []
 
         with open(csv_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
+            reader = csv.reader(f)
+
+            # Resolve column positions once rather than building a dict per row
+            header = next(reader, None)
+            if header is None:
+                logger.info("Imported 0 posters from CSV (file is empty)")
+                return []
+            columns = {name: i for i, name in enumerate(header)}
+            required = ('id', 'title', 'abstract', 'poster_image')
+            missing = [name for name in required if name not in columns]
+            if missing:
+                logger.error(f"CSV {csv_file} is missing required columns: {', '.join(missing)}")
+                return []
+            id_i, title_i, abstract_i, image_i = (columns[name] for name in required)
+
+            def column(row: List[str], name: str) -> str:
+                """Value of an optional column, '' if absent."""
+                i = columns.get(name)
+                return row[i] if i is not None else ''
+
+            def split_list(value: str) -> List[str]:
+                """Parse a semicolon-separated list."""
+                return [item.strip() for item in value.split(';') if item.strip()]
 
             for row in reader:
-                # Parse semicolon-separated lists
-                authors = [a.strip() for a in row.get('authors', '').split(';') if a.strip()]
-                tags = [t.strip() for t in row.get('tags', '').split(';') if t.strip()]
-                keywords = [k.strip() for k in row.get('keywords', '').split(';') if k.strip()]
+                if not row:
+                    continue
+                if len(row) < len(header):
+                    # Short or ragged line: missing trailing columns read as empty
+                    row += [''] * (len(header) - len(row))
+
+                keywords = split_list(column(row, 'keywords'))
+                contact_email = column(row, 'contact_email')
 
                 poster = {
-                    'id': row['id'],
-                    'title': row['title'],
-                    'authors': authors,
-                    'tags': tags,
-                    'abstract': row['abstract'],
-                    'poster_image': row['poster_image'],
+                    'id': row[id_i],
+                    'title': row[title_i],
+                    'authors': split_list(column(row, 'authors')),
+                    'tags': split_list(column(row, 'tags')),
+                    'abstract': row[abstract_i],
+                    'poster_image': row[image_i],
                     'metadata': {
                         'source': 'csv_import'
                     }
@@ -168,13 +220,13 @@ class PosterMetadataManager:
 
                 if keywords:
                     poster['keywords'] = keywords
-                if row.get('contact_email'):
-                    poster['contact_email'] = row['contact_email']
+                if contact_email:
+                    poster['contact_email'] = contact_email
 
                 if self.validate_poster(poster):
                     posters.append(poster)
                 else:
-                    logger.warning(f"Skipping invalid poster from CSV: {row.get('id')}")
+                    logger.warning(f"Skipping invalid poster from CSV: {poster['id']}")
 
         logger.info(f"Imported {len(posters)} posters from CSV")
         return posters
@@ -207,14 +259,21 @@ class PosterMetadataManager:
         logger.info(f"Imported {len(valid_posters)} posters from JSON")
         return valid_posters
 
-    def update_backend(self, new_posters: List[Dict[str, Any]], merge: bool = True) -> None:
+    def update_backend(self, new_posters: List[Dict[str, Any]], merge: bool = True) -> bool:
         """
         Update backend posters.json with new poster data.
 
         Args:
             new_posters: List of new/updated poster dictionaries
             merge: If True, merge with existing data. If False, replace entirely.
+
+        Returns:
+            True if every poster in the saved file passed validation
         """
+        # One timestamp for the whole batch, so every poster touched by this
+        # update and the file's last_updated agree
+        now = datetime.now().isoformat()
+
         if merge:
             # Load existing data
             data = self.load_existing_posters()
@@ -223,15 +282,13 @@ class PosterMetadataManager:
             # Merge or add posters
             updated_posters = []
             for new_poster in new_posters:
-                poster_id = new_poster['id']
-                if poster_id in existing_map:
-                    # Merge with existing
-                    merged = self.merge_poster(existing_map[poster_id], new_poster)
-                    updated_posters.append(merged)
-                    del existing_map[poster_id]
+                existing = existing_map.pop(new_poster['id'], None)
+                if existing is not None:
+                    # Merge with existing; it's about to be rewritten, so update in place
+                    updated_posters.append(self.merge_poster(existing, new_poster, now))
                 else:
                     # Add new poster
-                    updated_posters.append(self.add_poster(new_poster))
+                    updated_posters.append(self.add_poster(new_poster, now))
 
             # Add remaining existing posters that weren't updated
             updated_posters.extend(existing_map.values())
@@ -241,13 +298,33 @@ class PosterMetadataManager:
             # Replace entirely
             data = {
                 "schema_version": "1.0",
-                "posters": [self.add_poster(p) for p in new_posters]
+                "posters": [self.add_poster(p, now) for p in new_posters]
             }
 
+        # Validate what is about to be written, so there's no need to read it back
+        valid = self.validate_posters(data['posters'])
+
         # Save to backend
-        self.save_posters(data)
+        self.save_posters(data, now)
 
         logger.info(f"Backend updated successfully with {len(data['posters'])} posters")
+        return valid
+
+    def validate_posters(self, posters: List[Dict[str, Any]]) -> bool:
+        """Validate a list of posters, reporting all failures in one summary."""
+        errors: List[str] = []
+        for idx, poster in enumerate(posters):
+            if not self.validate_poster(poster, errors):
+                errors[-1] = f"[{idx}] {errors[-1]}"
+
+        if not errors:
+            logger.info("✓ Validation passed for %d posters", len(posters))
+            return True
+
+        logger.error("✗ Validation failed: %d posters invalid: %s%s",
+                     len(errors), "; ".join(errors[:10]),
+                     " ..." if len(errors) > 10 else "")
+        return False
 
     def validate_backend(self) -> bool:
         """Validate the current posters.json file."""
@@ -262,18 +339,7 @@ class PosterMetadataManager:
                 logger.error("Missing 'posters' field in posters.json")
                 return False
 
-            valid = True
-            for idx, poster in enumerate(data['posters']):
-                if not self.validate_poster(poster):
-                    logger.error(f"Poster at index {idx} failed validation")
-                    valid = False
-
-            if valid:
-                logger.info(f"✓ Validation passed for {len(data['posters'])} posters")
-            else:
-                logger.error("✗ Validation failed")
-
-            return valid
+            return self.validate_posters(data['posters'])
         except Exception as e:
             logger.error(f"Validation error: {e}")
             return False
@@ -352,10 +418,8 @@ def main():
 
     # Update backend
     merge = not args.replace
-    manager.update_backend(posters, merge=merge)
-
-    # Validate result
-    if manager.validate_backend():
+    # update_backend validates the posters it writes
+    if manager.update_backend(posters, merge=merge):
         logger.info("✓ Import completed successfully")
     else:
         logger.error("✗ Import completed but validation failed")
@@ -12,15 +12,19 @@ Usage:
     python extract_with_vision.py ~/my-posters/ --model llama3.2-vision:latest
 """
 
+import io
 import json
+import os
 import base64
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional
 import argparse
 import sys
 
 try:
+    import orjson
     from PIL import Image
     import yaml
 except ImportError:
@@ -28,11 +32,22 @@ except ImportError:
     print("Install with: pixi install")
     exit(1)
 
+from poster_common import (
+    OLLAMA_URL, get_ollama_session, load_checkpoint, load_overrides, open_checkpoint
+)
+
+# Poster image files picked up from the input directory
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg")
+
+# Poster scans are legitimately huge (an A0 page at 300 DPI is ~140 megapixels),
+# so raise Pillow's decompression-bomb limit above that on purpose
+Image.MAX_IMAGE_PIXELS = 300_000_000
+
 
 def check_ollama_available() -> bool:
     """Check if Ollama is running and accessible."""
     try:
-        response = requests.get("http://localhost:11434/api/tags", timeout=2)
+        response = get_ollama_session().get(f"{OLLAMA_URL}/api/tags", timeout=2)
         return response.status_code == 200
     except:
         return False
@@ -41,7 +56,7 @@ def check_ollama_available() -> bool:
 def get_available_vision_models() -> List[str]:
     """Get list of available vision models from Ollama."""
     try:
-        response = requests.get("http://localhost:11434/api/tags", timeout=2)
+        response = get_ollama_session().get(f"{OLLAMA_URL}/api/tags", timeout=2)
         if response.status_code == 200:
             models = response.json().get("models", [])
             # Filter for vision-capable models
@@ -56,26 +71,60 @@ def get_available_vision_models() -> List[str]:
         return []
 
 
-def encode_image_base64(image_path: Path) -> str:
-    """Encode image to base64 string."""
-    with open(image_path, "rb") as image_file:
-        return base64.b64encode(image_file.read()).decode("utf-8")
-
+def encode_image_base64(image_path: Path, max_edge: int = 2048) -> str:
+    """
+    Encode image to base64 string.
 
-def extract_metadata_from_image(image_path: Path, model: str = "gemma3:latest") -> Dict:
+    Images larger than max_edge on their longest side are downscaled first;
+    vision models resize their input to roughly 1-2k pixels anyway.
+    """
+    with Image.open(image_path) as image:
+        if max(image.size) <= max_edge:
+            data = image_path.read_bytes()
+        else:
+            source_format = image.format
+            has_alpha = image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info
+            image.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS)
+            buffer = io.BytesIO()
+            # Keep photos as JPEG: a downscaled JPEG re-encoded as PNG is larger
+            # than the original. PNG is only used for PNG sources and alpha.
+            if source_format != "PNG" and not has_alpha:
+                if image.mode not in ("RGB", "L"):
+                    image = image.convert("RGB")
+                image.save(buffer, format="JPEG", quality=90)
+            else:
+                if image.mode not in ("RGB", "RGBA", "L", "LA", "P"):
+                    image = image.convert("RGBA")
+                image.save(buffer, format="PNG")
+            data = buffer.getvalue()
+
+    # base64 output is pure ASCII, so skip the UTF-8 decoder's validation
+    return base64.b64encode(data).decode("ascii")
+
+
+def extract_metadata_from_image(
+    image_path: Path,
+    model: str = "gemma3:latest",
+    max_image_edge: int = 2048
+) -> Dict:
     """
     Use Ollama vision model to extract metadata from poster image.
 
     Args:
         image_path: Path to poster PNG image
         model: Ollama vision model to use
+        max_image_edge: Longest side, in pixels, of the image sent to the model
 
     Returns:
-        Dictionary with title, authors, tags, abstract
+        Dictionary with title, authors, tags, abstract, or None on failure
     """
 
-    # Encode image
-    image_base64 = encode_image_base64(image_path)
+    # Encode image; an unreadable file fails only this poster, not the batch
+    try:
+        image_base64 = encode_image_base64(image_path, max_image_edge)
+    except (OSError, Image.DecompressionBombError) as e:
+        print(f"  Error reading image {image_path.name}: {e}")
+        return None
 
     # Craft prompt for structured extraction
     prompt = """You are analyzing a research poster image. Extract the following information in JSON format:
@@ -98,15 +147,15 @@ Analyze the poster and extract the metadata:"""
 
     # Call Ollama API
     try:
-        response = requests.post(
-            "http://localhost:11434/api/generate",
-            json={
+        response = get_ollama_session().post(
+            f"{OLLAMA_URL}/api/generate",
+            data=orjson.dumps({
                 "model": model,
                 "prompt": prompt,
                 "images": [image_base64],
                 "stream": False,
                 "format": "json"  # Request JSON response
-            },
+            }),
             timeout=60  # Vision models can be slow
         )
 
@@ -114,12 +163,11 @@ Analyze the poster and extract the metadata:"""
             print(f"  Error: Ollama API returned {response.status_code}")
             return None
 
-        result = response.json()
-        response_text = result.get("response", "")
+        response_text = orjson.loads(response.content).get("response", "")
 
-        # Parse JSON response
+        # Parse JSON response (orjson.JSONDecodeError subclasses json's)
         try:
-            metadata = json.loads(response_text)
+            metadata = orjson.loads(response_text)
             return metadata
         except json.JSONDecodeError:
             print(f"  Warning: Model didn't return valid JSON")
@@ -134,19 +182,54 @@ Analyze the poster and extract the metadata:"""
         return None
 
 
-def load_overrides(overrides_file: Path) -> Dict:
-    """Load manual overrides from YAML file."""
-    if not overrides_file.exists():
-        return {}
-
-    try:
-        with open(overrides_file, 'r') as f:
-            overrides = yaml.safe_load(f) or {}
-        print(f"Loaded {len(overrides)} overrides from {overrides_file}")
-        return overrides
-    except Exception as e:
-        print(f"Warning: Could not load overrides: {e}")
-        return {}
+def build_poster_entry(
+    image_path: Path,
+    idx: int,
+    metadata: Optional[Dict],
+    overrides: Optional[Dict] = None
+) -> Dict:
+    """Turn a vision result (None if it failed) into a poster entry, applying overrides."""
+    poster_id = f"poster_{idx:03d}"
+    image_basename = image_path.stem
+    print(f"\nProcessing {image_path.name} → {poster_id}")
+
+    if not metadata:
+        print(f"  ⚠ Vision extraction failed, using defaults")
+        metadata = {
+            "title": f"Research Poster {poster_id}",
+            "authors": [],
+            "tags": [],
+            "abstract": ""
+        }
+    else:
+        print(f"  ✓ Extracted title: {metadata.get('title', 'N/A')}")
+        print(f"  ✓ Authors: {len(metadata.get('authors', []))} found")
+        print(f"  ✓ Tags: {', '.join(metadata.get('tags', [])[:3])}")
+
+    # Apply manual overrides if available
+    override = overrides.get(image_basename) if overrides else None
+    if override:
+        # Copy rather than update, so the model's metadata kept in the
+        # checkpoint stays free of overrides
+        metadata = {**metadata, **override}
+        if 'title' in override:
+            print(f"  ✓ Applied title override: {override['title']}")
+
+    # Create poster entry
+    poster = {
+        "id": poster_id,
+        "title": metadata.get("title", f"Research Poster {poster_id}"),
+        "authors": metadata.get("authors", []),
+        "tags": metadata.get("tags", []),
+        "room": "corridor",
+        "booth_id": f"booth_{idx}",
+        "abstract": metadata.get("abstract", ""),
+        "poster_image": f"res://assets/posters/{poster_id}.png",
+        "source_image": image_path.name,
+        "faq": []
+    }
+
+    return poster
 
 
 def process_poster_images(
@@ -154,11 +237,24 @@ def process_poster_images(
     output_json: Path,
     model: str,
     start_id: int = 1,
-    overrides: Optional[Dict] = None
+    overrides: Optional[Dict] = None,
+    concurrency: Optional[int] = None,
+    max_image_edge: int = 2048
 ) -> List[Dict]:
-    """Process all poster images in a directory using vision model."""
+    """
+    Process all poster images in a directory using vision model.
 
-    image_files = sorted(images_dir.glob("*.png")) + sorted(images_dir.glob("*.jpg"))
+    Up to `concurrency` images (default: min(8, number of images)) are sent
+    to Ollama at once; set OLLAMA_NUM_PARALLEL on the server to match.
+    Images checkpointed by an interrupted run with the same settings are not
+    sent again; overrides are applied to them afresh.
+    """
+
+    # One directory pass; sorting by name keeps PNGs and JPGs in a single order
+    image_files = sorted(
+        Path(entry.path) for entry in os.scandir(images_dir)
+        if entry.is_file() and entry.name.lower().endswith(IMAGE_EXTENSIONS)
+    )
 
     if not image_files:
         print(f"No image files found in {images_dir}")
@@ -167,64 +263,69 @@ def process_poster_images(
     print(f"Found {len(image_files)} poster images")
     if overrides:
         print(f"Using {len(overrides)} manual overrides")
-    print(f"Using vision model: {model}")
+    if concurrency is None:
+        concurrency = min(8, len(image_files))
+    concurrency = max(1, concurrency)
+    print(f"Using vision model: {model} ({concurrency} concurrent requests)")
     print("=" * 60)
 
-    posters = []
+    # Resume an interrupted run: a checkpointed image is skipped when it was
+    # sent with the same settings and got the same id it would get now
+    settings = {'model': model, 'max_image_edge': max_image_edge}
+    checkpoint_file = output_json.with_suffix('.jsonl')
+    checkpointed = load_checkpoint(checkpoint_file, 'source_image')
+    indices = range(start_id, start_id + len(image_files))
+    resumed = {}
+    for image_path, idx in zip(image_files, indices):
+        record = checkpointed.get(image_path.name)
+        if (record and record.get('id') == f"poster_{idx:03d}"
+                and record.get('settings') == settings):
+            resumed[image_path.name] = record
+    if checkpointed:
+        print(f"Resuming from {checkpoint_file}: reusing {len(resumed)} posters "
+              f"(delete it to start over)")
+        if len(resumed) < len(checkpointed):
+            print(f"  {len(checkpointed) - len(resumed)} checkpointed posters were made with "
+                  f"other settings or ids and will be extracted again")
+
+    pending = [
+        (image_path, idx) for image_path, idx in zip(image_files, indices)
+        if image_path.name not in resumed
+    ]
+
+    # Size the connection pool to the number of requests in flight
+    get_ollama_session().mount(OLLAMA_URL, requests.adapters.HTTPAdapter(pool_maxsize=concurrency))
+
+    # Vision calls are I/O-bound; run them in threads. map() yields results in
+    # image order as they arrive, and each image's metadata (before overrides)
+    # is appended to a JSONL checkpoint so an interrupted run keeps that work
+    output_json.parent.mkdir(parents=True, exist_ok=True)
+    new_posters = {}
 
-    for idx, image_path in enumerate(image_files, start=start_id):
-        poster_id = f"poster_{idx:03d}"
-        image_basename = image_path.stem
-        print(f"\nProcessing {image_path.name} → {poster_id}")
-
-        # Extract metadata using vision model
-        metadata = extract_metadata_from_image(image_path, model)
-
-        if not metadata:
-            print(f"  ⚠ Vision extraction failed, using defaults")
-            metadata = {
-                "title": f"Research Poster {poster_id}",
-                "authors": [],
-                "tags": [],
-                "abstract": ""
-            }
-        else:
-            print(f"  ✓ Extracted title: {metadata.get('title', 'N/A')}")
-            print(f"  ✓ Authors: {len(metadata.get('authors', []))} found")
-            print(f"  ✓ Tags: {', '.join(metadata.get('tags', [])[:3])}")
-
-        # Apply manual overrides if available
-        if overrides and image_basename in overrides:
-            override = overrides[image_basename]
-            if isinstance(override, str):
-                metadata['title'] = override
-                print(f"  ✓ Applied title override: {override}")
-            elif isinstance(override, dict):
-                if 'title' in override:
-                    metadata['title'] = override['title']
-                    print(f"  ✓ Applied title override: {override['title']}")
-                if 'authors' in override:
-                    metadata['authors'] = override['authors']
-                if 'tags' in override:
-                    metadata['tags'] = override['tags']
-                if 'abstract' in override:
-                    metadata['abstract'] = override['abstract']
-
-        # Create poster entry
-        poster = {
-            "id": poster_id,
-            "title": metadata.get("title", f"Research Poster {poster_id}"),
-            "authors": metadata.get("authors", []),
-            "tags": metadata.get("tags", []),
-            "room": "corridor",
-            "booth_id": f"booth_{idx}",
-            "abstract": metadata.get("abstract", ""),
-            "poster_image": f"res://assets/posters/{poster_id}.png",
-            "faq": []
-        }
+    with ThreadPoolExecutor(max_workers=concurrency) as executor, \
+            open_checkpoint(checkpoint_file) as checkpoint:
+        results = executor.map(
+            lambda item: extract_metadata_from_image(item[0], model, max_image_edge),
+            pending
+        )
 
-        posters.append(poster)
+        for (image_path, idx), metadata in zip(pending, results):
+            new_posters[image_path.name] = build_poster_entry(image_path, idx, metadata, overrides)
+            checkpoint.write(orjson.dumps({
+                'source_image': image_path.name,
+                'id': f"poster_{idx:03d}",
+                'settings': settings,
+                'metadata': metadata,
+            }) + b'\n')
+            checkpoint.flush()
 
+    posters = []
+    for image_path, idx in zip(image_files, indices):
+        record = resumed.get(image_path.name)
+        if record:
+            posters.append(build_poster_entry(image_path, idx, record['metadata'], overrides))
+        else:
+            posters.append(new_posters[image_path.name])
     return posters
 
 
@@ -253,6 +354,18 @@ def main():
         action="store_true",
         help="Merge with existing posters.json instead of replacing"
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="Concurrent requests to Ollama (default: min(8, number of images))"
+    )
+    parser.add_argument(
+        "--max-image-edge",
+        type=int,
+        default=2048,
+        help="Downscale images so their longest side is at most this many pixels (default: 2048)"
+    )
 
     args = parser.parse_args()
 
@@ -299,7 +412,9 @@ def main():
         output_json,
         args.model,
         args.start_id,
-        overrides
+        overrides,
+        args.concurrency,
+        args.max_image_edge
     )
 
     if not new_posters:
@@ -309,8 +424,7 @@ def main():
     # Load existing posters if merging
     existing_posters = []
     if args.merge and output_json.exists():
-        with open(output_json, 'r') as f:
-            existing_posters = json.load(f)
+        existing_posters = orjson.loads(output_json.read_bytes())
         print(f"\nMerging with {len(existing_posters)} existing posters")
 
     # Combine and save
@@ -319,8 +433,9 @@ def main():
     # Create output directory
     output_json.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(output_json, 'w') as f:
-        json.dump(all_posters, f, indent=2)
+    # Save; the checkpoint is no longer needed once this succeeds
+    output_json.write_bytes(orjson.dumps(all_posters, option=orjson.OPT_INDENT_2))
+    output_json.with_suffix('.jsonl').unlink(missing_ok=True)
 
     print("\n" + "=" * 60)
     print(f"✓ Saved {len(new_posters)} posters to {output_json}")
@@ -6,52 +6,82 @@ Install: pixi add pillow  OR  pip install pillow
 
 from PIL import Image, ImageDraw, ImageFont
 import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from typing import List
+
+
+FONT_PATH = "/System/Library/Fonts/Helvetica.ttc"
+
+
+@lru_cache(maxsize=None)
+def load_font(size: int):
+    """Load the poster font at a size, falling back to Pillow's default; shared across posters."""
+    try:
+        return ImageFont.truetype(FONT_PATH, size)
+    except OSError:
+        return ImageFont.load_default()
+
+
+@lru_cache(maxsize=4096)
+def text_length(font, text: str) -> float:
+    """Advance width of text in font; cached so repeated words are measured once."""
+    return font.getlength(text)
+
+
+def wrap_text(text: str, font, max_width: float) -> List[str]:
+    """Greedy word wrap that measures each word once instead of every candidate line."""
+    space_width = text_length(font, " ")
+    lines = []
+    current_line = []
+    line_width = 0.0
+    for word in text.split():
+        word_width = text_length(font, word)
+        if current_line and line_width + space_width + word_width > max_width:
+            lines.append(' '.join(current_line))
+            current_line = [word]
+            line_width = word_width
+        else:
+            line_width += (space_width if current_line else 0) + word_width
+            current_line.append(word)
+    lines.append(' '.join(current_line))
+    return lines
+
+
+@lru_cache(maxsize=None)
+def poster_background(size) -> Image.Image:
+    """White canvas with the blue header bar and gray footer; drawn once per size."""
+    img = Image.new('RGB', size, color='white')
+    draw = ImageDraw.Draw(img)
+    draw.rectangle([(0, 0), (size[0], 200)], fill='#2E86AB')
+    draw.rectangle([(0, size[1] - 100), (size[0], size[1])], fill='#F0F0F0')
+    return img
 
 
 def create_poster_image(poster_data: dict, output_path: Path, size=(1200, 1600)):
     """Create a simple poster image with title, authors, and abstract."""
 
-    # Create image with white background
-    img = Image.new('RGB', size, color='white')
+    # Start from the shared background with header and footer already drawn
+    img = poster_background(tuple(size)).copy()
     draw = ImageDraw.Draw(img)
 
     # Try to use a nice font, fall back to default if not available
-    try:
-        title_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 60)
-        author_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 40)
-        body_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 30)
-        tag_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 25)
-    except:
-        # Fallback to default font
-        title_font = ImageFont.load_default()
-        author_font = ImageFont.load_default()
-        body_font = ImageFont.load_default()
-        tag_font = ImageFont.load_default()
+    title_font = load_font(60)
+    author_font = load_font(40)
+    body_font = load_font(30)
+    tag_font = load_font(25)
 
     # Define margins and positions
     margin = 80
     y_pos = margin
 
-    # Draw colored header bar
-    draw.rectangle([(0, 0), (size[0], 200)], fill='#2E86AB')
-
     # Draw title (white on blue)
     title = poster_data['title']
     y_pos = 50
     # Word wrap title
-    words = title.split()
-    lines = []
-    current_line = []
-    for word in words:
-        current_line.append(word)
-        test_line = ' '.join(current_line)
-        bbox = draw.textbbox((0, 0), test_line, font=title_font)
-        if bbox[2] - bbox[0] > size[0] - 2 * margin:
-            current_line.pop()
-            lines.append(' '.join(current_line))
-            current_line = [word]
-    lines.append(' '.join(current_line))
+    lines = wrap_text(title, title_font, size[0] - 2 * margin)
 
     for line in lines:
         draw.text((margin, y_pos), line, fill='white', font=title_font)
@@ -75,19 +105,7 @@ def create_poster_image(poster_data: dict, output_path: Path, size=(1200, 1600))
     # Draw abstract
     abstract = poster_data['abstract']
     # Word wrap abstract
-    words = abstract.split()
-    lines = []
-    current_line = []
-    for word in words:
-        current_line.append(word)
-        test_line = ' '.join(current_line)
-        bbox = draw.textbbox((0, 0), test_line, font=body_font)
-        if bbox[2] - bbox[0] > size[0] - 2 * margin:
-            current_line.pop()
-            if current_line:
-                lines.append(' '.join(current_line))
-            current_line = [word]
-    lines.append(' '.join(current_line))
+    lines = wrap_text(abstract, body_font, size[0] - 2 * margin)
 
     for line in lines:
         if y_pos > size[1] - 200:  # Stop if we're near the bottom
@@ -97,7 +115,6 @@ def create_poster_image(poster_data: dict, output_path: Path, size=(1200, 1600))
 
     # Draw footer with booth info
     y_pos = size[1] - 100
-    draw.rectangle([(0, y_pos), (size[0], size[1])], fill='#F0F0F0')
     footer_text = f"Location: {poster_data.get('room', 'TBD')} - {poster_data.get('booth_id', 'TBD')}"
     draw.text((margin, y_pos + 30), footer_text, fill='#666666', font=tag_font)
 
@@ -118,11 +135,12 @@ def main():
     with open(data_file, 'r') as f:
         posters = json.load(f)
 
-    # Generate images for each poster
-    for poster in posters:
-        poster_id = poster['id']
-        output_path = output_dir / f"{poster_id}.png"
-        create_poster_image(poster, output_path)
+    # Generate images for each poster; rendering is CPU-bound and independent
+    # per poster, so spread it over worker processes (each loads its own fonts)
+    output_paths = [output_dir / f"{poster['id']}.png" for poster in posters]
+    workers = min(os.cpu_count() or 1, max(len(posters), 1))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(create_poster_image, posters, output_paths, chunksize=4))
 
     print(f"\n✓ Generated {len(posters)} poster images in {output_dir}")
     print("\nNext steps:")
@@ -0,0 +1,117 @@
+"""
+Helpers shared by the poster extraction scripts (extract_from_pdfs.py and
+extract_with_vision.py): the Ollama HTTP session, poster_overrides.yaml
+loading, the JSONL progress checkpoint and crash-safe file writes.
+
+Only orjson is imported up front; yaml and requests are imported where used
+so the scripts start quickly.
+"""
+
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict
+
+import orjson
+
+OLLAMA_URL = "http://localhost:11434"
+
+# Shared HTTP session so vision calls reuse keep-alive connections to Ollama
+_ollama_session = None
+
+
+def get_ollama_session() -> "requests.Session":
+    """Return the shared Ollama HTTP session, creating it on first use."""
+    global _ollama_session
+    if _ollama_session is None:
+        import requests
+
+        _ollama_session = requests.Session()
+        # Request bodies are serialized with orjson, so set the type ourselves
+        _ollama_session.headers["Content-Type"] = "application/json"
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=8)
+        _ollama_session.mount("http://", adapter)
+        _ollama_session.mount("https://", adapter)
+    return _ollama_session
+
+
+# Poster fields that poster_overrides.yaml may set
+OVERRIDE_FIELDS = ('title', 'authors', 'tags', 'abstract')
+
+
+def load_overrides(overrides_file: Path) -> Dict:
+    """Load manual overrides from YAML file."""
+    if not overrides_file.exists():
+        return {}
+
+    import yaml
+
+    try:
+        with open(overrides_file, 'r') as f:
+            overrides = yaml.safe_load(f) or {}
+        # Normalize once: a plain string is shorthand for a title override,
+        # and only the overridable fields of a mapping are kept
+        overrides = {
+            name: {'title': override} if isinstance(override, str)
+            else {field: override[field] for field in OVERRIDE_FIELDS if field in override}
+            for name, override in overrides.items()
+            if isinstance(override, (str, dict))
+        }
+        print(f"Loaded {len(overrides)} overrides from {overrides_file}")
+        return overrides
+    except Exception as e:
+        print(f"Warning: Could not load overrides: {e}")
+        return {}
+
+
+def load_checkpoint(checkpoint_file: Path, source_field: str) -> Dict[str, Dict]:
+    """Records saved to the JSONL checkpoint by an interrupted run, keyed by their source file name."""
+    records = {}
+    if not checkpoint_file.exists():
+        return records
+
+    with open(checkpoint_file, 'rb') as f:
+        for line in f:
+            try:
+                record = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                # A crash mid-write leaves a partial last line; that poster is redone
+                continue
+            if isinstance(record, dict) and source_field in record:
+                records[record[source_field]] = record
+    return records
+
+
+def open_checkpoint(checkpoint_file: Path) -> BinaryIO:
+    """Open the JSONL checkpoint for appending, after any line a crash left partial."""
+    checkpoint = open(checkpoint_file, 'ab')
+    if checkpoint.tell():
+        with open(checkpoint_file, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            complete = f.read(1) == b'\n'
+        if not complete:
+            # Terminate the partial line; load_checkpoint skips it
+            checkpoint.write(b'\n')
+    return checkpoint
+
+
+def _replace_atomically(path: Path, write: Callable[[Path], None]) -> None:
+    """Write a sibling temp file with write(tmp_path), then move it over path."""
+    # Unique per process and thread, since several workers may fill the same cache entry
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def write_bytes_atomic(path: Path, data: bytes) -> None:
+    """Write data to path so a crash leaves either the old file or the new one, never a partial one."""
+    _replace_atomically(path, lambda tmp_path: tmp_path.write_bytes(data))
+
+
+def copy_file_atomic(src: Path, dst: Path) -> None:
+    """Copy src to dst so a crash never leaves a partial dst behind."""
+    _replace_atomically(dst, lambda tmp_path: shutil.copyfile(src, tmp_path))
@@ -3,16 +3,22 @@ Update main.tscn to include poster materials and correct titles.
 Run this to update the Godot scene file directly.
 """
 
-import json
+import os
 from pathlib import Path
 import re
 
+import orjson
+
+# Label3D title text under a PosterBoothN node: (prefix, booth number, closing quote)
+LABEL_TITLE_RE = re.compile(
+    r'(\[node name="Label3D" parent="Interactables/PosterBooth(\d+)" index="4"\]\s*text = ")[^"]*(")'
+)
+
 
 def load_poster_data():
     """Load poster data from backend."""
     backend_data = Path(__file__).parent.parent / "backend" / "data" / "posters.json"
-    with open(backend_data, 'r') as f:
-        return json.load(f)
+    return orjson.loads(backend_data.read_bytes())
 
 
 def update_main_scene():
@@ -26,26 +32,35 @@ def update_main_scene():
 
     # Load poster data
     posters = load_poster_data()
-    poster_dict = {p['id']: p for p in posters[:5]}  # First 5 posters
-
-    print(f"Loaded {len(poster_dict)} posters from backend")
+    # Booth number for each poster id shown in the scene (PosterBooth1-5)
+    booths = {f"poster_{i:03d}": i for i in range(1, 6)}
 
     # Update titles (they're already correct in the file, but let's verify)
-    for i in range(1, 6):
-        poster_id = f"poster_{i:03d}"
-        if poster_id in poster_dict:
-            title = poster_dict[poster_id]['title']
-            # Find and replace the Label3D text for this booth
-            pattern = rf'(\[node name="Label3D" parent="Interactables/PosterBooth{i}" index="4"\]\s*text = ")[^"]*(")'
-            replacement = rf'\1{title}\2'
-            content = re.sub(pattern, replacement, content)
-            print(f"Updated PosterBooth{i} title: {title}")
-
-    # Write back
-    with open(scene_file, 'w') as f:
-        f.write(content)
-
-    print(f"\n✓ Updated {scene_file}")
+    titles = {booths[p['id']]: p['title'] for p in posters if p['id'] in booths}
+
+    print(f"Loaded {len(titles)} posters from backend")
+
+    def replace_title(match):
+        booth = int(match.group(2))
+        if booth not in titles:
+            return match.group(0)
+        print(f"Updated PosterBooth{booth} title: {titles[booth]}")
+        return f"{match.group(1)}{titles[booth]}{match.group(3)}"
+
+    # Replace every booth's Label3D text in a single pass over the scene
+    updated = LABEL_TITLE_RE.sub(replace_title, content)
+
+    if updated == content:
+        # Leave the file (and its mtime) alone so Godot doesn't reimport it
+        print(f"\n✓ {scene_file} already up to date")
+    else:
+        # Write to a sibling file and swap it in, so an interrupted run
+        # never leaves a truncated scene behind
+        tmp_file = scene_file.with_name(scene_file.name + ".tmp")
+        with open(tmp_file, 'w') as f:
+            f.write(updated)
+        os.replace(tmp_file, scene_file)
+        print(f"\n✓ Updated {scene_file}")
     print("\nNOTE: Materials will be applied when you run the Godot script.")
     print("The scene file has been updated with correct titles.")
     print("\nNext steps:")